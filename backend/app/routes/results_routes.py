@@ -10,10 +10,11 @@ Data is produced by:
     • app.services.fraud_detection.run_detection_pipeline()
 """
 
-import json
-
+import orjson
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import Response
+
+from app.utils.responses import ORJSON_OPTIONS, ORJSONResponse
 
 router = APIRouter(tags=["Results"])
 
@@ -31,7 +32,7 @@ async def get_results():
     """
     Return the complete detection results from the most recent analysis.
     """
-    return _get_cached()
+    return ORJSONResponse(_get_cached())
 
 
 @router.get("/risk-scores")
@@ -50,7 +51,7 @@ async def download_results():
     Allows judges / analysts to save the output locally.
     """
     result = _get_cached()
-    json_bytes = json.dumps(result, indent=2, ensure_ascii=False).encode("utf-8")
+    json_bytes = orjson.dumps(result, option=ORJSON_OPTIONS | orjson.OPT_INDENT_2)
     return Response(
         content=json_bytes,
         media_type="application/json",
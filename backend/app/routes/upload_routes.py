@@ -13,12 +13,12 @@ The heavy lifting is delegated to:
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import Any, BinaryIO
 
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
 
 from app.utils.helpers import validate_csv, save_upload, parse_csv
+from app.utils.responses import ORJSONResponse
 from app.services.fraud_detection import run_detection_pipeline
 
 logger = logging.getLogger(__name__)
@@ -28,6 +28,20 @@ router = APIRouter(tags=["Upload"])
 # Module-level cache so other routes can retrieve the latest results
 latest_result: dict[str, Any] | None = None
 
+# 400 details with fixed wording (missing columns: helpers.ERR_MISSING_COLUMNS)
+ERR_NOT_CSV = "Invalid file type. Only .csv files are accepted."
+ERR_EMPTY = "Uploaded file is empty."
+ERR_NO_ROWS = "CSV file contains no valid transaction rows after cleaning."
+
+
+def _is_blank(stream: BinaryIO, chunk_size: int = 1 << 16) -> bool:
+    """True if the stream holds nothing but whitespace. Stops at the first
+    chunk with content, so real CSVs are only touched for one chunk."""
+    while chunk := stream.read(chunk_size):
+        if chunk.strip():
+            return False
+    return True
+
 
 @router.post("/upload")
 async def upload_csv(file: UploadFile = File(...)):
@@ -56,20 +70,20 @@ async def upload_csv(file: UploadFile = File(...)):
     if not file.filename or not validate_csv(file.filename):
         raise HTTPException(
             status_code=400,
-            detail="Invalid file type. Only .csv files are accepted.",
+            detail=ERR_NOT_CSV,
         )
 
-    # ── 2. Read file bytes & reject empty uploads -------------------------
-    contents = await file.read()
-    if not contents or len(contents.strip()) == 0:
+    # ── 2. Reject empty uploads (scan only; the body is streamed below) ---
+    if _is_blank(file.file):
         raise HTTPException(
             status_code=400,
-            detail="Uploaded file is empty.",
+            detail=ERR_EMPTY,
         )
+    file.file.seek(0)
 
     # ── 3. Persist to uploads/ --------------------------------------------
     try:
-        filepath = save_upload(contents, file.filename)
+        filepath = save_upload(file.file, file.filename)
     except OSError as exc:
         logger.exception("Failed to save uploaded file")
         raise HTTPException(
@@ -93,7 +107,7 @@ async def upload_csv(file: UploadFile = File(...)):
     if df.empty:
         raise HTTPException(
             status_code=400,
-            detail="CSV file contains no valid transaction rows after cleaning.",
+            detail=ERR_NO_ROWS,
         )
 
     # ── 5. Run detection pipeline -----------------------------------------
@@ -108,4 +122,4 @@ async def upload_csv(file: UploadFile = File(...)):
 
     # ── 6. Cache & return -------------------------------------------------
     latest_result = result
-    return JSONResponse(content=result)
+    return ORJSONResponse(content=result)
@@ -10,26 +10,49 @@ Modules:
     fraud_detection  — End-to-end pipeline orchestrator
 """
 
-from app.services.graph_builder import build_graph, build_transaction_graph, graph_to_json, get_graph_stats
+from app.services.graph_builder import (
+    build_graph,
+    build_graph_csr,
+    build_transaction_graph,
+    graph_to_csr,
+    graph_to_json,
+    get_graph_stats,
+)
 from app.services.graph_features import (
     extract_graph_features,
     compute_pagerank,
     compute_betweenness,
     compute_degree_features,
+    compute_degree_features_csr,
     detect_fan_in,
+    detect_fan_in_csr,
     detect_fan_out,
+    detect_fan_out_csr,
     detect_cycles,
+    detect_cyclic_nodes,
+    iter_cycles,
     detect_communities,
 )
-from app.services.scoring import compute_risk_scores, classify_risk_tier
+from app.services.scoring import (
+    ScoreResult,
+    compute_risk_scores,
+    score_accounts,
+    classify_risk_tier,
+    classify_risk_tier_vec,
+    decode_reason_codes,
+    REASON_BITS,
+)
 from app.services.fraud_detection import run_detection_pipeline
 
 __all__ = [
-    "build_graph",
+    "build_graph", "build_graph_csr", "graph_to_csr",
     "build_transaction_graph", "graph_to_json", "get_graph_stats",
     "extract_graph_features",
     "compute_pagerank", "compute_betweenness", "compute_degree_features",
+    "compute_degree_features_csr", "detect_fan_in_csr", "detect_fan_out_csr",
     "detect_fan_in", "detect_fan_out", "detect_cycles", "detect_communities",
-    "compute_risk_scores", "classify_risk_tier",
+    "detect_cyclic_nodes", "iter_cycles",
+    "compute_risk_scores", "score_accounts", "ScoreResult", "classify_risk_tier", "classify_risk_tier_vec",
+    "decode_reason_codes", "REASON_BITS",
     "run_detection_pipeline",
 ]
@@ -41,7 +41,7 @@ import pandas as pd
 
 from app.services.graph_builder import build_graph, graph_to_json, get_graph_stats
 from app.services.graph_features import extract_graph_features
-from app.services.scoring import compute_risk_scores
+from app.services.scoring import ScoreResult, score_accounts
 from app.services.explanation_generator import generate_explanation
 
 logger = logging.getLogger(__name__)
@@ -239,7 +239,8 @@ def run_detection_pipeline(df: pd.DataFrame) -> dict[str, Any]:
     logger.info("Starting detection pipeline (%d rows)", len(df))
 
     sender_col, receiver_col, timestamp_col = _resolve_cols(df)
-    df[timestamp_col] = pd.to_datetime(df[timestamp_col], errors="coerce")
+    if not pd.api.types.is_datetime64_any_dtype(df[timestamp_col]):
+        df[timestamp_col] = pd.to_datetime(df[timestamp_col], errors="coerce")
 
     # Step 1: Build graph
     graph: nx.DiGraph = build_graph(df)
@@ -249,23 +250,31 @@ def run_detection_pipeline(df: pd.DataFrame) -> dict[str, Any]:
     features: dict[str, Any] = extract_graph_features(graph, tx_df=df)
 
     # Step 3: Score with additive + subtractive logic
-    scores_df: pd.DataFrame = compute_risk_scores(graph, features, tx_df=df)
+    result: ScoreResult = score_accounts(graph, features, tx_df=df)
 
-    # Build mutable per-account dict
+    # Build mutable per-account dict straight from the score columns
     scores: dict[str, dict[str, Any]] = {}
-    for row in scores_df.itertuples(index=False):
-        scores[row.account_id] = {
-            "account_id": row.account_id,
-            "suspicion_score": float(row.risk_score),
-            "detected_patterns": list(getattr(row, "reasons", [])),
+    for (
+        account_id, risk_score, reasons, pagerank, betweenness,
+        in_deg, out_deg, is_payroll, is_merchant, is_gateway,
+    ) in zip(
+        result.account_id, result.risk_score.tolist(), result.reasons,
+        result.pagerank.tolist(), result.betweenness.tolist(),
+        result.in_degree.tolist(), result.out_degree.tolist(),
+        result.is_payroll.tolist(), result.is_merchant.tolist(), result.is_gateway.tolist(),
+    ):
+        scores[account_id] = {
+            "account_id": account_id,
+            "suspicion_score": float(risk_score),
+            "detected_patterns": list(reasons),
             "ring_id": None,
-            "pagerank": float(getattr(row, "pagerank", 0.0)),
-            "betweenness": float(getattr(row, "betweenness", 0.0)),
-            "in_degree": int(getattr(row, "in_degree", 0)),
-            "out_degree": int(getattr(row, "out_degree", 0)),
-            "is_payroll": bool(getattr(row, "is_payroll", False)),
-            "is_merchant": bool(getattr(row, "is_merchant", False)),
-            "is_gateway": bool(getattr(row, "is_gateway", False)),
+            "pagerank": pagerank,
+            "betweenness": betweenness,
+            "in_degree": in_deg,
+            "out_degree": out_deg,
+            "is_payroll": is_payroll,
+            "is_merchant": is_merchant,
+            "is_gateway": is_gateway,
         }
 
     # Step 4: Ring assembly
@@ -8,6 +8,8 @@ transactions from sender → receiver.
 
 Primary API:
     - build_graph(df): build a directed transaction graph from DataFrame
+    - build_graph_csr(df) / graph_to_csr(G): flat CSR arrays for
+      degree-only analysis without NetworkX dicts
     - graph_to_json(G): export graph in frontend-friendly JSON structure
 
 Located in: app/services/graph_builder.py
@@ -17,9 +19,15 @@ Called by:   app/services/fraud_detection.py
 from __future__ import annotations
 
 import networkx as nx
+import numpy as np
 import pandas as pd
 from typing import Any
 
+# (nodes, indptr, indices, total_amount): row i's out-edges are
+# indices[indptr[i]:indptr[i + 1]], one entry per sender -> receiver pair,
+# sorted by receiver index within each row.
+CSRGraph = tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
 
 def _resolve_column_map(df: pd.DataFrame) -> dict[str, str]:
     """
@@ -114,19 +122,116 @@ def build_graph(df: pd.DataFrame) -> nx.DiGraph:
         timestamp=(timestamp_col, "last"),     # most-recent timestamp
     ).reset_index()
 
-    # --- Build graph in bulk using from_pandas_edgelist --------------------
-    # Faster than iterating rows; NetworkX handles DataFrame natively.
-    G = nx.from_pandas_edgelist(
-        grouped,
-        source=sender_col,
-        target=receiver_col,
-        edge_attr=["transaction_count", "total_amount", "amount", "timestamp"],
-        create_using=nx.DiGraph(),
+    # --- Build graph in bulk from plain Python lists -----------------------
+    # Same edges/order as from_pandas_edgelist, but each column is converted
+    # with one tolist() instead of iterating (Arrow-backed) Series per row.
+    attrs = zip(
+        grouped["transaction_count"].tolist(),
+        grouped["total_amount"].tolist(),
+        grouped["amount"].tolist(),
+        grouped["timestamp"].tolist(),
     )
+    G = nx.DiGraph()
+    G.add_edges_from(zip(
+        grouped[sender_col].tolist(),
+        grouped[receiver_col].tolist(),
+        (
+            {"transaction_count": c, "total_amount": t, "amount": a, "timestamp": ts}
+            for c, t, a, ts in attrs
+        ),
+    ))
 
     return G
 
 
+def build_graph_csr(df: pd.DataFrame) -> CSRGraph:
+    """
+    Build the transaction graph as CSR arrays instead of a DiGraph.
+
+    Applies the same cleaning and per-pair aggregation as build_graph();
+    nodes are numbered in the order build_graph() would insert them, and
+    each row's out-edges are sorted by receiver index.
+    """
+    column_map = _resolve_column_map(df)
+    sender_col = column_map["sender"]
+    receiver_col = column_map["receiver"]
+
+    labels, senders, receivers = _account_codes(df[sender_col], df[receiver_col])
+    amounts = pd.to_numeric(df[column_map["amount"]], errors="coerce").to_numpy(np.float64)
+    keep = ~np.isnan(amounts) & (senders >= 0) & (receivers >= 0)
+    senders, receivers, amounts = senders[keep], receivers[keep], amounts[keep]
+
+    # Interleave sender/receiver so first-appearance order matches build_graph
+    codes, order = pd.factorize(np.column_stack([senders, receivers]).ravel())
+    nodes = labels[order]
+    n = len(nodes)
+    src, dst = codes[0::2], codes[1::2]
+
+    # Collapse repeated sender -> receiver pairs into one weighted edge
+    pair_ids, first = np.unique(src.astype(np.int64) * n + dst, return_inverse=True)
+    total = np.bincount(first, weights=amounts, minlength=len(pair_ids)).astype(np.float64)
+    pair_src, pair_dst = np.divmod(pair_ids, n)
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(pair_src, minlength=n), out=indptr[1:])
+    return nodes, indptr, pair_dst, total
+
+
+def _account_codes(
+    senders: pd.Series, receivers: pd.Series,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Map both ID columns onto one label array: (labels, sender codes, receiver codes).
+
+    IDs are stripped as in build_graph(); empty IDs get code -1. When both
+    columns share a categorical dtype (parse_csv() output) only the category
+    dictionary is cleaned and the int codes are remapped, so no per-row
+    strings are built.
+    """
+    if isinstance(senders.dtype, pd.CategoricalDtype) and senders.dtype == receivers.dtype:
+        # Missing IDs (code -1) index the trailing "nan", matching astype(str)
+        categories = senders.cat.categories.astype(str).str.strip()
+        remap, labels = pd.factorize(np.append(categories.to_numpy(object), "nan"))
+        sender_codes = remap[senders.cat.codes.to_numpy()]
+        receiver_codes = remap[receivers.cat.codes.to_numpy()]
+    else:
+        n = len(senders)
+        stacked = pd.concat([senders, receivers], ignore_index=True)
+        codes, labels = pd.factorize(stacked.astype(str).str.strip())
+        sender_codes, receiver_codes = codes[:n], codes[n:]
+
+    labels = np.asarray(labels, dtype=object)
+    empty = np.flatnonzero(labels == "")
+    if len(empty):
+        sender_codes = np.where(sender_codes == empty[0], -1, sender_codes)
+        receiver_codes = np.where(receiver_codes == empty[0], -1, receiver_codes)
+    return labels, sender_codes, receiver_codes
+
+
+def graph_to_csr(G: nx.DiGraph) -> CSRGraph:
+    """
+    Convert a DiGraph from build_graph() into CSR arrays (same node order).
+
+    Each row's out-edges are sorted by receiver index, as in
+    build_graph_csr(), rather than kept in adjacency insertion order.
+    """
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum([len(G.succ[node]) for node in nodes], out=indptr[1:])
+    indices = np.fromiter(
+        (index[v] for node in nodes for v in G.succ[node]),
+        dtype=np.int64, count=indptr[-1],
+    )
+    total = np.fromiter(
+        (data.get("total_amount", 0.0) for node in nodes for data in G.succ[node].values()),
+        dtype=np.float64, count=indptr[-1],
+    )
+    rows = np.repeat(np.arange(len(nodes)), np.diff(indptr))
+    order = np.lexsort((indices, rows))
+    return np.asarray(nodes, dtype=object), indptr, indices[order], total[order]
+
+
 def build_transaction_graph(df: pd.DataFrame) -> nx.DiGraph:
     """
     Backward-compatible wrapper around build_graph().
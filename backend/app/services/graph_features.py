@@ -30,14 +30,23 @@ from __future__ import annotations
 
 import logging
 from collections import defaultdict
-from datetime import timedelta
-from typing import Any
+from typing import Any, Iterator
 
 import community as community_louvain  # python-louvain
 import networkx as nx
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:  # optional: the sliding-window sweep then runs in Python
+    njit = None
+
+try:
+    import rustworkx as rx
+except ImportError:  # optional: PageRank then runs in NetworkX
+    rx = None
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -55,6 +64,13 @@ _SHELL_MIN_HOPS: int = 3
 _SHELL_DEGREE_MIN: int = 2
 _SHELL_DEGREE_MAX: int = 3
 
+# GPU dispatch: when the nx-cugraph backend is installed, centrality calls
+# are routed to it explicitly (falling back to NetworkX for anything it
+# does not implement). Communities stay on python-louvain.
+_NX_GPU_BACKEND: str | None = (
+    "cugraph" if "cugraph" in nx.utils.backends.backends else None
+)
+
 
 # =========================================================================
 # Helper: find column name
@@ -70,11 +86,42 @@ def _find_column(df: pd.DataFrame, candidates: list[str]) -> str | None:
 # =========================================================================
 # 1. Centrality
 # =========================================================================
+def _nx_call(func, G: nx.DiGraph, **kwargs):
+    """Call a dispatchable NetworkX algorithm on the GPU backend if present."""
+    if _NX_GPU_BACKEND is not None:
+        try:
+            return dict(func(G, backend=_NX_GPU_BACKEND, **kwargs))
+        except NotImplementedError:
+            pass
+    return func(G, **kwargs)
+
+
 def compute_pagerank(G: nx.DiGraph) -> dict[str, float]:
-    """PageRank weighted by total_amount."""
+    """PageRank weighted by total_amount.
+
+    Runs natively in rustworkx when it is installed (and no GPU backend is).
+    """
     if G.number_of_nodes() == 0:
         return {}
-    return nx.pagerank(G, weight="total_amount")
+    if rx is not None and _NX_GPU_BACKEND is None:
+        return _rx_pagerank(G)
+    # NetworkX >= 3.0 runs this as a SciPy sparse power iteration already
+    return _nx_call(nx.pagerank, G, weight="total_amount")
+
+
+def _rx_pagerank(G: nx.DiGraph) -> dict[str, float]:
+    """nx.pagerank(G, weight="total_amount") computed by rustworkx."""
+    nodes = list(G)
+    index = {node: i for i, node in enumerate(nodes)}
+    R = rx.PyDiGraph(multigraph=False)
+    R.add_nodes_from(nodes)
+    # Edge payload is the weight; missing total_amount weighs 1 as in NetworkX
+    R.add_edges_from([
+        (index[u], index[v], float(data.get("total_amount", 1.0)))
+        for u, v, data in G.edges(data=True)
+    ])
+    scores = rx.pagerank(R, alpha=0.85, weight_fn=float, tol=1e-06, max_iter=100)
+    return {node: scores[i] for i, node in enumerate(nodes)}
 
 
 def compute_betweenness(G: nx.DiGraph) -> dict[str, float]:
@@ -85,20 +132,50 @@ def compute_betweenness(G: nx.DiGraph) -> dict[str, float]:
     _SAMPLE_THRESHOLD = 5_000
     if n > _SAMPLE_THRESHOLD:
         k = min(200, n)
-        return nx.betweenness_centrality(
-            G, k=k, weight="total_amount", normalized=True, seed=42
+        return _nx_call(
+            nx.betweenness_centrality,
+            G, k=k, weight="total_amount", normalized=True, seed=42,
         )
-    return nx.betweenness_centrality(G, weight="total_amount", normalized=True)
+    return _nx_call(
+        nx.betweenness_centrality, G, weight="total_amount", normalized=True,
+    )
 
 
 # =========================================================================
 # 2. Degree features
 # =========================================================================
 def compute_degree_features(G: nx.DiGraph) -> tuple[dict[str, int], dict[str, int]]:
-    """Return (in_degree_dict, out_degree_dict)."""
+    """Return (in_degree_dict, out_degree_dict).
+
+    Reads adjacency sizes straight from the DiGraph internals to skip the
+    DegreeView (node, degree) tuple per node; falls back to the public API
+    for graph types without ``_pred``/``_succ``.
+    """
+    if hasattr(G, "_pred") and hasattr(G, "_succ"):
+        pred, succ = G._pred, G._succ
+        return {n: len(pred[n]) for n in G._node}, {n: len(succ[n]) for n in G._node}
     return dict(G.in_degree()), dict(G.out_degree())
 
 
+def _degree_arrays(
+    G: nx.DiGraph, in_deg: dict[str, int], out_deg: dict[str, int],
+) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """Node-aligned (nodes, in_degree, out_degree) arrays for mask-based filters."""
+    nodes = list(G.nodes())
+    n = len(nodes)
+    in_arr = np.fromiter((in_deg[v] for v in nodes), dtype=np.int64, count=n)
+    out_arr = np.fromiter((out_deg[v] for v in nodes), dtype=np.int64, count=n)
+    return nodes, in_arr, out_arr
+
+
+def compute_degree_features_csr(
+    indptr: np.ndarray, indices: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return (in_degree, out_degree) arrays for a CSR graph from graph_builder."""
+    n = len(indptr) - 1
+    return np.bincount(indices, minlength=n), np.diff(indptr)
+
+
 # =========================================================================
 # 3. Fan-in / Fan-out (basic degree)
 # =========================================================================
@@ -111,9 +188,11 @@ def detect_fan_in(
     _out_deg: dict[str, int] | None = None,
 ) -> list[str]:
     """Degree-based fan-in detection."""
-    in_deg = _in_deg or dict(G.in_degree())
-    out_deg = _out_deg or dict(G.out_degree())
-    return [n for n in G.nodes() if in_deg[n] >= min_in and out_deg[n] <= max_out]
+    if _in_deg is None or _out_deg is None:
+        _in_deg, _out_deg = compute_degree_features(G)
+    nodes, in_arr, out_arr = _degree_arrays(G, _in_deg, _out_deg)
+    mask = (in_arr >= min_in) & (out_arr <= max_out)
+    return [nodes[i] for i in np.flatnonzero(mask)]
 
 
 def detect_fan_out(
@@ -125,29 +204,78 @@ def detect_fan_out(
     _out_deg: dict[str, int] | None = None,
 ) -> list[str]:
     """Degree-based fan-out detection."""
-    in_deg = _in_deg or dict(G.in_degree())
-    out_deg = _out_deg or dict(G.out_degree())
-    return [n for n in G.nodes() if out_deg[n] >= min_out and in_deg[n] <= max_in]
+    if _in_deg is None or _out_deg is None:
+        _in_deg, _out_deg = compute_degree_features(G)
+    nodes, in_arr, out_arr = _degree_arrays(G, _in_deg, _out_deg)
+    mask = (out_arr >= min_out) & (in_arr <= max_in)
+    return [nodes[i] for i in np.flatnonzero(mask)]
+
+
+def detect_fan_in_csr(
+    nodes: np.ndarray, indptr: np.ndarray, indices: np.ndarray,
+    min_in: int = _FAN_IN_MIN_IN_DEGREE,
+    max_out: int = _FAN_IN_MAX_OUT_DEGREE,
+) -> list[str]:
+    """detect_fan_in over CSR arrays (no NetworkX graph needed)."""
+    in_arr, out_arr = compute_degree_features_csr(indptr, indices)
+    return nodes[(in_arr >= min_in) & (out_arr <= max_out)].tolist()
+
+
+def detect_fan_out_csr(
+    nodes: np.ndarray, indptr: np.ndarray, indices: np.ndarray,
+    min_out: int = _FAN_OUT_MIN_OUT_DEGREE,
+    max_in: int = _FAN_OUT_MAX_IN_DEGREE,
+) -> list[str]:
+    """detect_fan_out over CSR arrays (no NetworkX graph needed)."""
+    in_arr, out_arr = compute_degree_features_csr(indptr, indices)
+    return nodes[(out_arr >= min_out) & (in_arr <= max_in)].tolist()
 
 
 # =========================================================================
 # 4. Cycle detection (length 3-5, directed)
 # =========================================================================
+def _cyclic_scc_nodes(G: nx.DiGraph) -> set[str]:
+    """Union of the strongly connected components with more than one node."""
+    return set().union(
+        *(scc for scc in nx.strongly_connected_components(G) if len(scc) > 1)
+    )
+
+
+def detect_cyclic_nodes(G: nx.DiGraph) -> set[str]:
+    """Nodes on any directed cycle (any length, self-loops included).
+
+    One Tarjan SCC pass, O(V+E), with no cycle enumeration. This is a
+    superset of detect_cycles()' nodes, which only counts cycles of 3-5.
+    """
+    cyclic = _cyclic_scc_nodes(G)
+    cyclic.update(nx.nodes_with_selfloops(G))
+    return cyclic
+
+
+def iter_cycles(G: nx.DiGraph, length_bound: int = _MAX_CYCLE_LENGTH) -> Iterator[list[str]]:
+    """Lazily yield directed simple cycles of length 3 to ``length_bound``.
+
+    ``nx.simple_cycles`` already splits G into strongly connected components
+    and skips trivial ones, so G is passed as is.
+    """
+    for cycle in nx.simple_cycles(G, length_bound=length_bound):
+        if len(cycle) >= 3:
+            yield cycle
+
+
 def detect_cycles(
     G: nx.DiGraph,
     length_bound: int = _MAX_CYCLE_LENGTH,
     max_cycles: int = _MAX_CYCLES_COLLECTED,
 ) -> tuple[list[list[str]], list[str]]:
-    """Find directed simple cycles of length 3 to 5.
+    """Find directed simple cycles of length 3 to 5 (first ``max_cycles``).
     Returns (cycles_list, nodes_in_cycles).
     """
     cycles: list[list[str]] = []
     seen: set[str] = set()
     nodes_in_cycles: list[str] = []
 
-    for cycle in nx.simple_cycles(G, length_bound=length_bound):
-        if len(cycle) < 3:
-            continue
+    for cycle in iter_cycles(G, length_bound):
         cycles.append(cycle)
         for node in cycle:
             if node not in seen:
@@ -177,6 +305,10 @@ def detect_fan_in_out_72h(
 ) -> dict[str, Any]:
     """Detect smurfing: >=10 unique senders/receivers within any 72h window.
 
+    One timestamp sort, then a linear sweep per account over int codes
+    (see _windowed_unique_counts); ``groupby().rolling("72h")`` has no
+    distinct-count reduction, so it can't express this directly.
+
     Returns dict with: fan_in_nodes_72h, fan_out_nodes_72h,
                        fan_in_counts, fan_out_counts
     """
@@ -199,25 +331,17 @@ def detect_fan_in_out_72h(
     df["_ts"] = pd.to_datetime(df[ts_col], errors="coerce")
     df = df.dropna(subset=["_ts"]).sort_values("_ts")
 
-    window = timedelta(hours=window_hours)
+    ts_ns = df["_ts"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    window_ns = window_hours * 3_600 * 1_000_000_000
 
-    # Fan-in: for each receiver, count max unique senders in window
-    fan_in_counts: dict[str, int] = {}
-    for recv, grp in df.groupby(receiver_col, sort=False):
-        if len(grp) < unique_threshold:
-            continue
-        mx = _max_unique_in_window(grp["_ts"].values, grp[sender_col].values, window)
-        if mx >= unique_threshold:
-            fan_in_counts[str(recv)] = mx
-
-    # Fan-out: for each sender, count max unique receivers in window
-    fan_out_counts: dict[str, int] = {}
-    for send, grp in df.groupby(sender_col, sort=False):
-        if len(grp) < unique_threshold:
-            continue
-        mx = _max_unique_in_window(grp["_ts"].values, grp[receiver_col].values, window)
-        if mx >= unique_threshold:
-            fan_out_counts[str(send)] = mx
+    # Fan-in: for each receiver, max unique senders in any window;
+    # fan-out: for each sender, max unique receivers.
+    fan_in_counts = _windowed_unique_counts(
+        df[receiver_col], df[sender_col], ts_ns, window_ns, unique_threshold,
+    )
+    fan_out_counts = _windowed_unique_counts(
+        df[sender_col], df[receiver_col], ts_ns, window_ns, unique_threshold,
+    )
 
     logger.debug("72h fan-in: %d | fan-out: %d", len(fan_in_counts), len(fan_out_counts))
     return {
@@ -228,30 +352,90 @@ def detect_fan_in_out_72h(
     }
 
 
-def _max_unique_in_window(
-    timestamps: np.ndarray, counterparties: np.ndarray, window: timedelta,
-) -> int:
-    """Sliding window: max unique counterparties within window."""
-    if len(timestamps) == 0:
-        return 0
-    ts = pd.to_datetime(timestamps)
-    max_unique = 0
-    left = 0
-    for right in range(len(ts)):
-        while left < right and (ts[right] - ts[left]) > window:
-            left += 1
-        unique = len(set(counterparties[left:right + 1]))
-        if unique > max_unique:
-            max_unique = unique
-    return max_unique
+def _windowed_unique_counts(
+    keys: pd.Series, others: pd.Series, ts_ns: np.ndarray,
+    window_ns: int, threshold: int,
+) -> dict[str, int]:
+    """Per key, the max number of distinct ``others`` within any window.
+
+    Rows must already be in timestamp order. Keys and counterparties are
+    factorised to int codes; a stable sort by key code groups each key's
+    rows while keeping them time-ordered, and one two-pointer sweep per
+    group does the counting. Only keys reaching ``threshold`` are returned,
+    in order of first appearance.
+    """
+    key_codes, key_labels = pd.factorize(keys)
+    if len(key_codes) == 0:
+        return {}
+    other_codes, other_labels = pd.factorize(others)
+    other_codes = np.where(other_codes < 0, len(other_labels), other_codes)  # NaN: one value
+
+    order = np.argsort(key_codes, kind="stable")
+    sorted_keys = key_codes[order]
+    bounds = np.flatnonzero(np.diff(sorted_keys)) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [len(sorted_keys)]))
+    # Unparseable keys (code -1) and groups too small to ever qualify
+    keep = (sorted_keys[starts] >= 0) & (ends - starts >= threshold)
+    starts, ends = starts[keep], ends[keep]
+    if len(starts) == 0:
+        return {}
+
+    ts_sorted = ts_ns[order]
+    others_sorted = other_codes[order]
+    if njit is not None:
+        counts = np.zeros(len(other_labels) + 1, dtype=np.int64)
+        best = _max_unique_kernel(ts_sorted, others_sorted, starts, ends, window_ns, counts)
+    else:
+        counts = [0] * (len(other_labels) + 1)
+        best = _max_unique_sweep(
+            ts_sorted.tolist(), others_sorted.tolist(),
+            starts.tolist(), ends.tolist(), window_ns, counts,
+        )
+
+    labels = key_labels[sorted_keys[starts]]
+    return {
+        str(label): int(mx) for label, mx in zip(labels, best) if mx >= threshold
+    }
+
+
+def _max_unique_sweep(ts, others, starts, ends, window_ns, counts):
+    """Two-pointer sweep per [start, end) group; ``counts`` must be all zero.
+
+    Same source runs as plain Python (lists) or numba-compiled (arrays).
+    """
+    best = [0] * len(starts)
+    for g in range(len(starts)):
+        lo, hi = starts[g], ends[g]
+        left = lo
+        distinct = 0
+        max_unique = 0
+        for right in range(lo, hi):
+            while left < right and ts[right] - ts[left] > window_ns:
+                counts[others[left]] -= 1
+                if counts[others[left]] == 0:
+                    distinct -= 1
+                left += 1
+            if counts[others[right]] == 0:
+                distinct += 1
+            counts[others[right]] += 1
+            if distinct > max_unique:
+                max_unique = distinct
+        for i in range(left, hi):  # reset for the next group
+            counts[others[i]] = 0
+        best[g] = max_unique
+    return best
+
+
+_max_unique_kernel = njit(cache=True)(_max_unique_sweep) if njit is not None else None
 
 
 def _fan_in_out_degree_fallback(G: nx.DiGraph, threshold: int) -> dict[str, Any]:
     """Fallback when no timestamps available."""
-    in_deg = dict(G.in_degree())
-    out_deg = dict(G.out_degree())
-    fan_in = [n for n in G.nodes() if in_deg.get(n, 0) >= threshold]
-    fan_out = [n for n in G.nodes() if out_deg.get(n, 0) >= threshold]
+    in_deg, out_deg = compute_degree_features(G)
+    nodes, in_arr, out_arr = _degree_arrays(G, in_deg, out_deg)
+    fan_in = [nodes[i] for i in np.flatnonzero(in_arr >= threshold)]
+    fan_out = [nodes[i] for i in np.flatnonzero(out_arr >= threshold)]
     return {
         "fan_in_nodes_72h": fan_in,
         "fan_out_nodes_72h": fan_out,
@@ -268,32 +452,38 @@ def detect_layered_shell_chains(
     min_hops: int = _SHELL_MIN_HOPS,
     degree_min: int = _SHELL_DEGREE_MIN,
     degree_max: int = _SHELL_DEGREE_MAX,
+    *,
+    _in_deg: dict[str, int] | None = None,
+    _out_deg: dict[str, int] | None = None,
 ) -> dict[str, Any]:
     """Detect chains >=3 hops where intermediates have degree 2-3.
 
     Returns dict with: shell_chains, shell_nodes, nodes_in_chains
     """
-    in_deg = dict(G.in_degree())
-    out_deg = dict(G.out_degree())
+    if _in_deg is None or _out_deg is None:
+        _in_deg, _out_deg = compute_degree_features(G)
+    in_deg, out_deg = _in_deg, _out_deg
 
     # Shell candidates: degree 2-3, has both in and out
-    shell_candidates: set[str] = set()
-    for node in G.nodes():
-        td = in_deg.get(node, 0) + out_deg.get(node, 0)
-        if degree_min <= td <= degree_max and in_deg.get(node, 0) >= 1 and out_deg.get(node, 0) >= 1:
-            shell_candidates.add(node)
+    nodes, in_arr, out_arr = _degree_arrays(G, in_deg, out_deg)
+    total = in_arr + out_arr
+    candidate_mask = (
+        (total >= degree_min) & (total <= degree_max) & (in_arr >= 1) & (out_arr >= 1)
+    )
+    shell_candidates: set[str] = {nodes[i] for i in np.flatnonzero(candidate_mask)}
 
     chains: list[list[str]] = []
     shell_nodes: set[str] = set()
     all_chain_nodes: set[str] = set()
     visited_chains: set[tuple[str, ...]] = set()
 
-    # Trace from non-shell sources through shell intermediaries
-    for source in sorted(G.nodes()):
-        if source in shell_candidates:
-            continue
-        if out_deg.get(source, 0) == 0:
-            continue
+    # Trace from non-shell sources through shell intermediaries. Only
+    # predecessors of a candidate can start a chain, so the scan is bounded
+    # by the (low-degree) candidates' in-edges instead of every node.
+    sources = {
+        pred for node in shell_candidates for pred in G.pred[node]
+    } - shell_candidates
+    for source in sorted(sources):
         for nbr in sorted(G.successors(source)):
             if nbr in shell_candidates:
                 chain = [source, nbr]
@@ -341,13 +531,31 @@ def _trace_shell_chain(
 # =========================================================================
 # 7. Community detection (Louvain)
 # =========================================================================
-def detect_communities(G: nx.DiGraph) -> dict[str, int]:
-    """Louvain community detection on undirected projection."""
+def detect_communities(
+    G: nx.DiGraph, *, return_array: bool = False,
+) -> dict[str, int] | tuple[np.ndarray, np.ndarray]:
+    """Louvain community detection on undirected projection.
+
+    With ``return_array=True`` returns ``(nodes, labels)`` instead of a
+    dict: nodes in G's order and their community ids as an int32 array.
+    """
     if G.number_of_nodes() == 0:
+        if return_array:
+            return np.empty(0, dtype=object), np.empty(0, dtype=np.int32)
         return {}
-    undirected: nx.Graph = G.to_undirected()
+    # Bare undirected projection: Louvain only reads topology (no "weight"
+    # attribute is set on our edges), so skip copying node/edge attributes.
+    undirected = nx.Graph()
+    undirected.add_nodes_from(G)
+    undirected.add_edges_from(G.edges())
     partition: dict[str, int] = community_louvain.best_partition(undirected)
     logger.debug("Louvain communities: %d", len(set(partition.values())))
+    if return_array:
+        nodes = np.fromiter(G, dtype=object, count=G.number_of_nodes())
+        labels = np.fromiter(
+            (partition[node] for node in nodes), dtype=np.int32, count=len(nodes),
+        )
+        return nodes, labels
     return partition
 
 
@@ -384,34 +592,16 @@ def compute_velocity_features(
     df[sender_col] = df[sender_col].astype(str).str.strip()
     df[receiver_col] = df[receiver_col].astype(str).str.strip()
 
-    # Build sender-side stats via groupby
-    send_stats = df.groupby(sender_col)["_ts"].agg(["count", "min", "max"])
-    send_stats.columns = ["count", "ts_min", "ts_max"]
-
-    # Build receiver-side stats via groupby
-    recv_stats = df.groupby(receiver_col)["_ts"].agg(["count", "min", "max"])
-    recv_stats.columns = ["count", "ts_min", "ts_max"]
-
-    # Merge both sides per account
-    all_nodes = set(send_stats.index) | set(recv_stats.index)
-    velocity: dict[str, float] = {}
-
-    for node in all_nodes:
-        s = send_stats.loc[node] if node in send_stats.index else None
-        r = recv_stats.loc[node] if node in recv_stats.index else None
-
-        total_count = (s["count"] if s is not None else 0) + (r["count"] if r is not None else 0)
-
-        if total_count < 2:
-            velocity[node] = float(total_count)
-            continue
-
-        ts_min = min(x for x in [s["ts_min"] if s is not None else None, r["ts_min"] if r is not None else None] if x is not None)
-        ts_max = max(x for x in [s["ts_max"] if s is not None else None, r["ts_max"] if r is not None else None] if x is not None)
-
-        days = max((ts_max - ts_min).total_seconds() / 86400, 0.01)
-        velocity[node] = total_count / days
+    # One groupby over both sides: each transaction counts for its sender
+    # and its receiver, and spans the union of their timestamps.
+    accounts = pd.concat([df[sender_col], df[receiver_col]], ignore_index=True)
+    stamps = pd.concat([df["_ts"], df["_ts"]], ignore_index=True)
+    stats = stamps.groupby(accounts, sort=False).agg(["count", "min", "max"])
 
+    counts = stats["count"].to_numpy(np.float64)
+    days = np.maximum((stats["max"] - stats["min"]).dt.total_seconds().to_numpy() / 86400, 0.01)
+    rates = np.where(counts < 2, counts, counts / days)
+    velocity: dict[str, float] = dict(zip(stats.index, rates.tolist()))
     return velocity
 
 
@@ -442,17 +632,22 @@ def compute_cycle_metadata(
 # =========================================================================
 # 10. Forwarding ratio computation (Edge Case 1, 6)
 # =========================================================================
-def compute_forwarding_ratios(G: nx.DiGraph) -> dict[str, float]:
+def compute_forwarding_ratios(
+    G: nx.DiGraph,
+    *,
+    _out_deg: dict[str, int] | None = None,
+) -> dict[str, float]:
     """For each node, what fraction of its receivers also forward funds.
     Low forwarding ratio = more likely payroll (receivers are endpoints).
     """
+    out_deg = _out_deg if _out_deg is not None else compute_degree_features(G)[1]
     ratios: dict[str, float] = {}
     for node in G.nodes():
         successors = list(G.successors(node))
         if not successors:
             ratios[node] = 0.0
             continue
-        forwarding = sum(1 for s in successors if G.out_degree(s) > 0)
+        forwarding = sum(1 for s in successors if out_deg[s] > 0)
         ratios[node] = forwarding / len(successors)
     return ratios
 
@@ -485,7 +680,7 @@ def extract_graph_features(G: nx.DiGraph, tx_df: pd.DataFrame | None = None) ->
     cycle_metadata = compute_cycle_metadata(cycles, G)
 
     # Shell chains - Edge Case 10
-    shell_data = detect_layered_shell_chains(G)
+    shell_data = detect_layered_shell_chains(G, _in_deg=in_degree, _out_deg=out_degree)
 
     # 72h smurfing - Edge Case 5 (temporal rule)
     fan_72h = detect_fan_in_out_72h(G, tx_df)
@@ -494,7 +689,7 @@ def extract_graph_features(G: nx.DiGraph, tx_df: pd.DataFrame | None = None) ->
     velocity = compute_velocity_features(tx_df)
 
     # Forwarding ratios - Edge Cases 1, 6
-    forwarding_ratios = compute_forwarding_ratios(G)
+    forwarding_ratios = compute_forwarding_ratios(G, _out_deg=out_degree)
 
     # Communities
     communities = detect_communities(G)
@@ -31,7 +31,9 @@ Tier thresholds:
 from __future__ import annotations
 
 import logging
-from collections import defaultdict
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
 from statistics import mean
 from typing import Any
 
@@ -39,6 +41,11 @@ import networkx as nx
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:  # optional: the NumPy kernel below is used instead
+    njit = None
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -73,17 +80,105 @@ _MERCHANT_MAX_OUT: int = 1
 _GATEWAY_MIN_IN: int = 50
 _GATEWAY_MIN_OUT: int = 50
 _LOW_AMOUNT_THRESHOLD: float = 1000.0
+_EMPTY_META: dict[str, Any] = {}     # shared default for nodes without cycle metadata
+
+
+# ---------------------------------------------------------------------------
+# Reason codes - scoring ORs bit flags into a uint16 column (reason_codes);
+# strings are materialised per row from this table, in the order reasons
+# appear in the output.
+# ---------------------------------------------------------------------------
+_R_CYCLE: int = 1 << 0
+_R_CYCLE_SINGLE_LOW: int = 1 << 1
+_R_SMURF_IN: int = 1 << 2
+_R_SMURF_OUT: int = 1 << 3
+_R_SHELL: int = 1 << 4
+_R_VELOCITY: int = 1 << 5
+_R_PAGERANK: int = 1 << 6
+_R_BETWEENNESS: int = 1 << 7
+_R_COMMUNITY: int = 1 << 8
+_R_PAYROLL: int = 1 << 9
+_R_MERCHANT: int = 1 << 10
+_R_GATEWAY: int = 1 << 11
+_R_LOW_AMOUNT_CYCLE: int = 1 << 12
+
+_REASON_TABLE: tuple[tuple[int, str], ...] = (
+    (_R_CYCLE, "Account is part of a transaction cycle"),
+    (_R_CYCLE_SINGLE_LOW, "Account is part of a low-frequency transaction cycle"),
+    (_R_SMURF_IN, "smurfing_fan_in_72h"),
+    (_R_SMURF_OUT, "smurfing_fan_out_72h"),
+    (_R_SHELL, "shell_account"),
+    (_R_VELOCITY, "high_velocity"),
+    (_R_PAGERANK, "High PageRank (central in transaction network)"),
+    (_R_BETWEENNESS, "High betweenness centrality (intermediary account)"),
+    (_R_COMMUNITY, "Part of suspicious transaction community"),
+    (_R_PAYROLL, "likely_payroll"),
+    (_R_MERCHANT, "likely_merchant"),
+    (_R_GATEWAY, "likely_gateway"),
+    (_R_LOW_AMOUNT_CYCLE, "low_amount_cycle"),
+)
+_CYCLE_REASON_MASK: int = _R_CYCLE | _R_CYCLE_SINGLE_LOW
+
+# Public names for the reason_codes bits, for masking the column directly
+# (e.g. ``df["reason_codes"] & REASON_BITS["cycle"]``).
+REASON_BITS: dict[str, int] = {
+    "cycle": _R_CYCLE,
+    "cycle_single_low": _R_CYCLE_SINGLE_LOW,
+    "smurfing_fan_in_72h": _R_SMURF_IN,
+    "smurfing_fan_out_72h": _R_SMURF_OUT,
+    "shell_account": _R_SHELL,
+    "high_velocity": _R_VELOCITY,
+    "high_pagerank": _R_PAGERANK,
+    "high_betweenness": _R_BETWEENNESS,
+    "community": _R_COMMUNITY,
+    "likely_payroll": _R_PAYROLL,
+    "likely_merchant": _R_MERCHANT,
+    "likely_gateway": _R_GATEWAY,
+    "low_amount_cycle": _R_LOW_AMOUNT_CYCLE,
+}
+
+
+@lru_cache(maxsize=None)
+def _reason_strings(code: int) -> tuple[str, ...]:
+    return tuple(text for bit, text in _REASON_TABLE if code & bit)
+
+
+def decode_reason_codes(code: int) -> list[str]:
+    """Reason strings for a ``reason_codes`` value (without cycle_length_N tags)."""
+    return list(_reason_strings(int(code)))
+
+
+def _decode_reasons(code: int, cycle_lengths: tuple[int, ...]) -> list[str]:
+    """Expand a reason bitmask; cycle_length_N tags follow the cycle reason."""
+    return [
+        *_reason_strings(code & _CYCLE_REASON_MASK),
+        *(f"cycle_length_{clen}" for clen in cycle_lengths),
+        *_reason_strings(code & ~_CYCLE_REASON_MASK),
+    ]
 
 
 # -- Tier classification ---------------------------------------------------
+_TIER_ORDER: list[str] = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+_TIER_BOUNDS: np.ndarray = np.array([40, 60, 80], dtype=np.float64)  # lower bounds, inclusive
+_TIERS: np.ndarray = np.array(_TIER_ORDER, dtype=object)
+_TIER_BOUNDS_SCALAR: tuple[float, ...] = tuple(_TIER_BOUNDS.tolist())
+
+
 def classify_risk_tier(score: float) -> str:
-    if score >= 80:
-        return "CRITICAL"
-    if score >= 60:
-        return "HIGH"
-    if score >= 40:
-        return "MEDIUM"
-    return "LOW"
+    # bisect on a tuple: same lookup as the vectorised path without
+    # NumPy's per-call array conversion for a single score
+    if score != score:  # NaN sorts past every bound; it is LOW, not CRITICAL
+        return _TIER_ORDER[0]
+    return _TIER_ORDER[bisect_right(_TIER_BOUNDS_SCALAR, score)]
+
+
+def classify_risk_tier_vec(scores: np.ndarray) -> np.ndarray:
+    """Vectorised classify_risk_tier: one branchless table lookup per score.
+
+    NaN scores map to LOW, as in classify_risk_tier().
+    """
+    scores = np.nan_to_num(scores, nan=0.0)
+    return _TIERS[np.searchsorted(_TIER_BOUNDS, scores, side="right")]
 
 
 # -- Suppression detection -------------------------------------------------
@@ -118,6 +213,16 @@ def is_likely_payroll(
     return True
 
 
+# Degree thresholds shared by is_likely_* and the vectorised flag masks;
+# each takes plain ints or int arrays (``&`` works on both).
+def _merchant_degrees(in_deg: int | np.ndarray, out_deg: int | np.ndarray) -> bool | np.ndarray:
+    return (in_deg >= _MERCHANT_MIN_IN) & (out_deg <= _MERCHANT_MAX_OUT)
+
+
+def _gateway_degrees(in_deg: int | np.ndarray, out_deg: int | np.ndarray) -> bool | np.ndarray:
+    return (in_deg >= _GATEWAY_MIN_IN) & (out_deg >= _GATEWAY_MIN_OUT)
+
+
 def is_likely_merchant(
     node_id: str, G: nx.DiGraph,
     nodes_in_cycles: set[str], shell_nodes: set[str],
@@ -125,10 +230,7 @@ def is_likely_merchant(
     """Edge Case 2: High in-degree, near-zero out-degree.
     Merchant receives from many, sends to very few.
     """
-    in_deg = G.in_degree(node_id)
-    out_deg = G.out_degree(node_id)
-
-    if in_deg < _MERCHANT_MIN_IN or out_deg > _MERCHANT_MAX_OUT:
+    if not _merchant_degrees(G.in_degree(node_id), G.out_degree(node_id)):
         return False
     if node_id in nodes_in_cycles:
         return False
@@ -142,17 +244,206 @@ def is_likely_gateway(
     nodes_in_cycles: set[str],
 ) -> bool:
     """Edge Case 3: Very high in-degree AND out-degree, no cycles."""
-    in_deg = G.in_degree(node_id)
-    out_deg = G.out_degree(node_id)
-
-    if in_deg < _GATEWAY_MIN_IN or out_deg < _GATEWAY_MIN_OUT:
+    if not _gateway_degrees(G.in_degree(node_id), G.out_degree(node_id)):
         return False
     if node_id in nodes_in_cycles:
         return False
     return True
 
 
+# -- Per-node flag pre-pass --------------------------------------------------
+_NODE_FLAGS_DTYPE = np.dtype([
+    ("in_cycle", "?"), ("cycle_full", "?"), ("low_cycle", "?"),
+    ("smurf_in", "?"), ("smurf_out", "?"), ("shell", "?"), ("fast", "?"),
+    ("payroll", "?"), ("merchant", "?"), ("gateway", "?"),
+    ("primary", "?"), ("low_act", "?"),
+])
+
+
+def _isin(nodes: list[str], members: set[str] | frozenset[str]) -> np.ndarray:
+    """Boolean mask of ``nodes`` that belong to ``members``."""
+    return np.fromiter((n in members for n in nodes), dtype=bool, count=len(nodes))
+
+
+def _compute_node_flags(
+    G: nx.DiGraph,
+    nodes: list[str],
+    out_degree: dict[str, int],
+    cycle_set: set[str],
+    cycle_metadata: dict[str, dict[str, Any]],
+    shell_nodes: set[str],
+    fan_in_72h: frozenset[str],
+    fan_out_72h: frozenset[str],
+    velocity: dict[str, float],
+    forwarding_ratios: dict[str, float],
+) -> np.ndarray:
+    """Evaluate every per-node scoring predicate as a boolean column.
+
+    Degree-only predicates (merchant / gateway / payroll pre-filter,
+    low-activity) are array masks; only payroll candidates still need the
+    per-node successor walk in ``is_likely_payroll``.
+    """
+    n = len(nodes)
+    flags = np.zeros(n, dtype=_NODE_FLAGS_DTYPE)
+    if n == 0:
+        return flags
+
+    g_in = np.fromiter((d for _, d in G.in_degree(nodes)), dtype=np.int64, count=n)
+    g_out = np.fromiter((d for _, d in G.out_degree(nodes)), dtype=np.int64, count=n)
+    feat_out = np.fromiter((out_degree.get(v, 0) for v in nodes), dtype=np.int64, count=n)
+
+    in_cycle = _isin(nodes, cycle_set)
+    shell = _isin(nodes, shell_nodes)
+    flags["in_cycle"] = in_cycle
+    flags["shell"] = shell
+    flags["smurf_in"] = _isin(nodes, fan_in_72h)
+    flags["smurf_out"] = _isin(nodes, fan_out_72h)
+    flags["fast"] = np.fromiter(
+        (velocity.get(v, 0.0) > _VELOCITY_THRESHOLD for v in nodes), dtype=bool, count=n,
+    )
+
+    # Edge Cases 4 / 8: cycle validation by frequency and amount
+    for i in np.flatnonzero(in_cycle):
+        meta = cycle_metadata.get(nodes[i], _EMPTY_META)
+        cycle_count = meta.get("cycle_count", 1)
+        max_amount = meta.get("max_cycle_amount", 0.0)
+        flags["cycle_full"][i] = cycle_count >= 2 or max_amount > _LOW_AMOUNT_THRESHOLD
+        flags["low_cycle"][i] = max_amount < _LOW_AMOUNT_THRESHOLD and cycle_count <= 1
+
+    # Edge Cases 1-3: suppression masks (same rules as is_likely_*)
+    flags["merchant"] = _merchant_degrees(g_in, g_out) & ~in_cycle & ~shell
+    flags["gateway"] = _gateway_degrees(g_in, g_out) & ~in_cycle
+    for i in np.flatnonzero((g_out >= _PAYROLL_MIN_OUT) & ~in_cycle & ~shell):
+        flags["payroll"][i] = is_likely_payroll(
+            nodes[i], G, cycle_set, shell_nodes, forwarding_ratios,
+        )
+
+    primary = (
+        flags["cycle_full"] | flags["smurf_in"] | flags["smurf_out"]
+        | shell | flags["fast"]
+    )
+    flags["primary"] = primary
+    # Edge Case 6: low-activity accounts without any primary signal
+    flags["low_act"] = (feat_out <= 2) & ~primary
+    return flags
+
+
+# -- Score kernel -------------------------------------------------------------
+# Signed weight per signal row; compute_risk_scores stacks its boolean
+# masks in this order (additive signals first, then suppressions).
+_SIGNAL_WEIGHTS: np.ndarray = np.array([
+    _W_CYCLE, _W_CYCLE_SINGLE_LOW, _W_SMURF_72H, _W_SHELL_CHAIN, _W_VELOCITY,
+    _W_PAGERANK, _W_BETWEENNESS, _W_COMMUNITY,
+    -_S_PAYROLL, -_S_MERCHANT, -_S_GATEWAY, -_S_LOW_ACTIVITY, -_S_LOW_AMOUNT_CYCLE,
+], dtype=np.int16)
+
+
+def _score_kernel_np(signals: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted sum of the (n_signals, n_nodes) 0/1 matrix, clamped to [0, 100]."""
+    return np.clip(weights @ signals, 0, 100).astype(np.int16)
+
+
+if njit is not None:
+    # Serial on purpose: a parallel=True kernel starts numba's worker pool
+    # (TBB/OpenMP), which deadlocks interpreter exit when first launched
+    # from a non-main thread (e.g. the TestClient/ASGI lifespan thread).
+    @njit(cache=True)
+    def _score_kernel(signals: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Fused weighted sum + clamp, one pass over nodes."""
+        n_signals, n_nodes = signals.shape
+        out = np.empty(n_nodes, dtype=np.int16)
+        for i in range(n_nodes):
+            s = 0
+            for k in range(n_signals):
+                s += weights[k] * signals[k, i]
+            out[i] = 0 if s < 0 else (100 if s > 100 else s)
+        return out
+else:
+    _score_kernel = _score_kernel_np
+
+
 # -- Risk scoring -----------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class ScoreResult:
+    """Column arrays from score_accounts(), one entry per node in graph order.
+
+    ``to_pandas()`` gives the DataFrame compute_risk_scores() returns;
+    callers that only walk the rows can zip the columns directly.
+    """
+
+    account_id: list[str]
+    risk_score: np.ndarray          # int16
+    risk_tier: np.ndarray           # object: LOW / MEDIUM / HIGH / CRITICAL
+    reasons: list[list[str]]
+    reason_codes: np.ndarray        # uint16, see REASON_BITS
+    pagerank: np.ndarray            # float64
+    betweenness: np.ndarray         # float64
+    in_degree: np.ndarray           # int64
+    out_degree: np.ndarray          # int64
+    is_payroll: np.ndarray          # bool
+    is_merchant: np.ndarray         # bool
+    is_gateway: np.ndarray          # bool
+
+    def __len__(self) -> int:
+        return len(self.account_id)
+
+    def to_pandas(self) -> pd.DataFrame:
+        if not self.account_id:
+            return _EMPTY_SCORES.copy(deep=False)
+        # The column arrays are freshly built and never mutated afterwards,
+        # so let pandas adopt them instead of copying each one (dict input
+        # copies by default).
+        return pd.DataFrame({
+            "account_id": self.account_id,
+            "risk_score": self.risk_score,
+            "risk_tier": pd.Categorical(self.risk_tier, categories=_TIER_ORDER, ordered=True),
+            "reasons": self.reasons,
+            "reason_codes": self.reason_codes,
+            "pagerank": self.pagerank,
+            "betweenness": self.betweenness,
+            "in_degree": self.in_degree,
+            "out_degree": self.out_degree,
+            "is_payroll": self.is_payroll,
+            "is_merchant": self.is_merchant,
+            "is_gateway": self.is_gateway,
+        }, copy=False)
+
+
+# Zero-row result with the same schema compute_risk_scores returns
+_EMPTY_SCORES: pd.DataFrame = pd.DataFrame({
+    "account_id": pd.Series([], dtype="str"),
+    "risk_score": np.empty(0, dtype=np.int16),
+    "risk_tier": pd.Categorical([], categories=_TIER_ORDER, ordered=True),
+    "reasons": pd.Series([], dtype=object),
+    "reason_codes": np.empty(0, dtype=np.uint16),
+    "pagerank": np.empty(0, dtype=np.float64),
+    "betweenness": np.empty(0, dtype=np.float64),
+    "in_degree": np.empty(0, dtype=np.int64),
+    "out_degree": np.empty(0, dtype=np.int64),
+    "is_payroll": np.empty(0, dtype=bool),
+    "is_merchant": np.empty(0, dtype=bool),
+    "is_gateway": np.empty(0, dtype=bool),
+})
+
+
+def _empty_result() -> ScoreResult:
+    """Zero-row ScoreResult, built fresh per call (its lists are mutable).
+
+    Tiers go through classify_risk_tier_vec so the dtype matches the
+    non-empty path.
+    """
+    score = np.empty(0, dtype=np.int16)
+    return ScoreResult(
+        account_id=[], risk_score=score,
+        risk_tier=classify_risk_tier_vec(score), reasons=[],
+        reason_codes=np.empty(0, dtype=np.uint16),
+        pagerank=np.empty(0, dtype=np.float64), betweenness=np.empty(0, dtype=np.float64),
+        in_degree=np.empty(0, dtype=np.int64), out_degree=np.empty(0, dtype=np.int64),
+        is_payroll=np.empty(0, dtype=bool), is_merchant=np.empty(0, dtype=bool),
+        is_gateway=np.empty(0, dtype=bool),
+    )
+
+
 def compute_risk_scores(
     graph: nx.DiGraph,
     features: dict[str, Any],
@@ -161,10 +452,23 @@ def compute_risk_scores(
     """Compute per-account: Pattern Score - Legitimacy Score = Final Suspicion.
 
     Returns DataFrame with columns:
-        account_id, risk_score, risk_tier, reasons,
+        account_id, risk_score, risk_tier, reasons, reason_codes,
         pagerank, betweenness, in_degree, out_degree,
         is_payroll, is_merchant, is_gateway
     """
+    return score_accounts(graph, features, tx_df).to_pandas()
+
+
+def score_accounts(
+    graph: nx.DiGraph,
+    features: dict[str, Any],
+    tx_df: pd.DataFrame | None = None,
+) -> ScoreResult:
+    """compute_risk_scores() without the DataFrame: the same columns as arrays."""
+    if graph.number_of_nodes() == 0:
+        logger.info("Scored 0 accounts")
+        return _empty_result()
+
     # Unpack features
     pagerank: dict[str, float] = features.get("pagerank", {})
     betweenness: dict[str, float] = features.get("betweenness", {})
@@ -180,14 +484,20 @@ def compute_risk_scores(
     shell_data = features.get("shell_data", {})
     shell_nodes: set[str] = set(shell_data.get("shell_nodes", []))
     fan_72h = features.get("fan_72h", {})
+    fan_in_72h: frozenset[str] = frozenset(fan_72h.get("fan_in_counts", {}))
+    fan_out_72h: frozenset[str] = frozenset(fan_72h.get("fan_out_counts", {}))
     velocity = features.get("velocity", {})
     forwarding_ratios = features.get("forwarding_ratios", {})
 
-    # Build cycle membership details
-    node_cycle_lengths: dict[str, set[int]] = defaultdict(set)
+    # Build cycle membership details: node -> sorted unique cycle lengths
+    lengths_by_node: dict[str, set[int]] = {}
     for cycle in cycles:
+        clen = len(cycle)
         for node in cycle:
-            node_cycle_lengths[node].add(len(cycle))
+            lengths_by_node.setdefault(node, set()).add(clen)
+    node_cycle_lengths: dict[str, tuple[int, ...]] = {
+        node: tuple(sorted(lens)) for node, lens in lengths_by_node.items()
+    }
 
     # Thresholds
     pr_values = list(pagerank.values())
@@ -195,163 +505,84 @@ def compute_risk_scores(
     pr_threshold = (mean(pr_values) * _THRESHOLD_MULT) if pr_values else 0.0
     bt_threshold = (mean(bt_values) * _THRESHOLD_MULT) if bt_values else 0.0
 
-    # Pre-compute suppression sets
-    payroll_set: set[str] = set()
-    merchant_set: set[str] = set()
-    gateway_set: set[str] = set()
-
-    for node in graph.nodes():
-        if is_likely_payroll(node, graph, cycle_set, shell_nodes, forwarding_ratios):
-            payroll_set.add(node)
-        if is_likely_merchant(node, graph, cycle_set, shell_nodes):
-            merchant_set.add(node)
-        if is_likely_gateway(node, graph, cycle_set):
-            gateway_set.add(node)
-
-    # Score every node
-    rows: list[dict[str, Any]] = []
-
-    for node in graph.nodes():
-        score = 0
-        reasons: list[str] = []
-        has_primary = False
-
-        # ===== ADDITIVE: Primary signals =====
-
-        # --- Cycle participation (Edge Case 4: validate frequency/amount) ---
-        if node in cycle_set:
-            meta = cycle_metadata.get(node, {})
-            cycle_count = meta.get("cycle_count", 1)
-            max_amount = meta.get("max_cycle_amount", 0.0)
-
-            if cycle_count >= 2 or max_amount > _LOW_AMOUNT_THRESHOLD:
-                # Repeating cycle or high amount = real fraud
-                score += _W_CYCLE
-                has_primary = True
-                reasons.append("Account is part of a transaction cycle")
-            else:
-                # Edge Case 4: single low-value cycle (family transfer?)
-                score += _W_CYCLE_SINGLE_LOW
-                reasons.append("Account is part of a low-frequency transaction cycle")
-
-            for clen in sorted(node_cycle_lengths.get(node, [])):
-                reasons.append(f"cycle_length_{clen}")
-
-        # --- Smurfing 72h (Edge Case 5: temporal rule) ---
-        fan_in_72h = fan_72h.get("fan_in_counts", {})
-        fan_out_72h = fan_72h.get("fan_out_counts", {})
-        if node in fan_in_72h or node in fan_out_72h:
-            score += _W_SMURF_72H
-            has_primary = True
-            if node in fan_in_72h:
-                reasons.append("smurfing_fan_in_72h")
-            if node in fan_out_72h:
-                reasons.append("smurfing_fan_out_72h")
-
-        # --- Shell chain (Edge Case 10) ---
-        if node in shell_nodes:
-            score += _W_SHELL_CHAIN
-            has_primary = True
-            reasons.append("shell_account")
-
-        # --- High velocity (Edge Case 7) ---
-        node_velocity = velocity.get(node, 0.0)
-        if node_velocity > _VELOCITY_THRESHOLD:
-            score += _W_VELOCITY
-            has_primary = True
-            reasons.append("high_velocity")
-
-        # ===== ADDITIVE: Supporting signals (only with primary) =====
-
-        node_pr = pagerank.get(node, 0.0)
-        if has_primary and node_pr > pr_threshold:
-            score += _W_PAGERANK
-            reasons.append("High PageRank (central in transaction network)")
-
-        node_bt = betweenness.get(node, 0.0)
-        if has_primary and node_bt > bt_threshold:
-            score += _W_BETWEENNESS
-            reasons.append("High betweenness centrality (intermediary account)")
-
-        # Edge Case 9: community membership (only boost if primary present)
-        if has_primary and node in communities:
-            score += _W_COMMUNITY
-            reasons.append("Part of suspicious transaction community")
-
-        # ===== SUBTRACTIVE: Suppress false positives =====
-
-        # Edge Case 1: Payroll suppression
-        is_pay = node in payroll_set
-        if is_pay:
-            score -= _S_PAYROLL
-            reasons.append("likely_payroll")
-
-        # Edge Case 2: Merchant suppression
-        is_merch = node in merchant_set
-        if is_merch:
-            score -= _S_MERCHANT
-            reasons.append("likely_merchant")
-
-        # Edge Case 3: Gateway suppression
-        is_gw = node in gateway_set
-        if is_gw:
-            score -= _S_GATEWAY
-            reasons.append("likely_gateway")
-
-        # Edge Case 6: Low-activity (salary then spending)
-        node_out = out_degree.get(node, 0)
-        if node_out <= 2 and not has_primary:
-            score -= _S_LOW_ACTIVITY
-            # Don't add reason for this, it just lowers score
-
-        # Edge Case 8: Low-amount cycle trap
-        if node in cycle_set:
-            meta = cycle_metadata.get(node, {})
-            if meta.get("max_cycle_amount", 0.0) < _LOW_AMOUNT_THRESHOLD:
-                if meta.get("cycle_count", 1) <= 1:
-                    score -= _S_LOW_AMOUNT_CYCLE
-                    reasons.append("low_amount_cycle")
-
-        # ===== Clamp [0, 100] =====
-        score = min(100, max(0, score))
-
-        tier = classify_risk_tier(score)
-
-        # Force suppressed accounts to LOW
-        if is_pay or is_merch or is_gw:
-            if score < 40:
-                tier = "LOW"
-
-        rows.append({
-            "account_id": node,
-            "risk_score": score,
-            "risk_tier": tier,
-            "reasons": reasons,
-            "pagerank": node_pr,
-            "betweenness": node_bt,
-            "in_degree": in_degree.get(node, 0),
-            "out_degree": out_degree.get(node, 0),
-            "is_payroll": is_pay,
-            "is_merchant": is_merch,
-            "is_gateway": is_gw,
-        })
-
-    df = pd.DataFrame(rows)
-
-    if df.empty:
-        df = pd.DataFrame(columns=[
-            "account_id", "risk_score", "risk_tier", "reasons",
-            "pagerank", "betweenness", "in_degree", "out_degree",
-            "is_payroll", "is_merchant", "is_gateway",
-        ])
-
+    # Per-node feature columns (SoA), aligned with graph node order.
+    # Centralities are non-negative, so a missing node's 0.0 never clears
+    # the threshold, matching a membership test on the dict.
+    nodes: list[str] = list(graph.nodes())
+    n_nodes = len(nodes)
+    pr_arr = np.fromiter((pagerank.get(v, 0.0) for v in nodes), dtype=np.float64, count=n_nodes)
+    bt_arr = np.fromiter((betweenness.get(v, 0.0) for v in nodes), dtype=np.float64, count=n_nodes)
+
+    # Per-node flag pre-pass (one contiguous bool column per predicate)
+    flags = _compute_node_flags(
+        graph, nodes, out_degree, cycle_set, cycle_metadata, shell_nodes,
+        fan_in_72h, fan_out_72h, velocity, forwarding_ratios,
+    )
+    in_cycle = flags["in_cycle"]
+    cycle_full = flags["cycle_full"]
+    cycle_single_low = in_cycle & ~cycle_full
+    smurf_in = flags["smurf_in"]
+    smurf_out = flags["smurf_out"]
+    primary = flags["primary"]
+
+    # Supporting signals only count alongside a primary signal
+    # (Edge Case 9: Louvain assigns every node, so community alone is noise)
+    pr_high = primary & (pr_arr > pr_threshold)
+    bt_high = primary & (bt_arr > bt_threshold)
+    in_community = primary & _isin(nodes, frozenset(communities))
+
+    # ===== Pattern Score - Legitimacy Score, clamped to [0, 100] =====
+    signals = np.vstack([
+        cycle_full, cycle_single_low, smurf_in | smurf_out, flags["shell"],
+        flags["fast"], pr_high, bt_high, in_community,
+        flags["payroll"], flags["merchant"], flags["gateway"],
+        flags["low_act"], flags["low_cycle"],
+    ]).view(np.uint8)
+    score = _score_kernel(signals, _SIGNAL_WEIGHTS)
+
+    # Suppressed accounts under 40 land in LOW through the tier table itself
+    tiers = classify_risk_tier_vec(score)
+
+    # Reason bitmask per node, expanded to strings once per row
+    codes = np.zeros(n_nodes, dtype=np.uint16)
+    for bit, mask in (
+        (_R_CYCLE, cycle_full), (_R_CYCLE_SINGLE_LOW, cycle_single_low),
+        (_R_SMURF_IN, smurf_in), (_R_SMURF_OUT, smurf_out),
+        (_R_SHELL, flags["shell"]), (_R_VELOCITY, flags["fast"]),
+        (_R_PAGERANK, pr_high), (_R_BETWEENNESS, bt_high),
+        (_R_COMMUNITY, in_community), (_R_PAYROLL, flags["payroll"]),
+        (_R_MERCHANT, flags["merchant"]), (_R_GATEWAY, flags["gateway"]),
+        (_R_LOW_AMOUNT_CYCLE, flags["low_cycle"]),
+    ):
+        codes[mask] |= bit
+    reasons_col = [
+        _decode_reasons(code, node_cycle_lengths.get(node, ()) if cyc else ())
+        for node, code, cyc in zip(nodes, codes.tolist(), in_cycle.tolist())
+    ]
+
+    tier_counts = np.bincount(
+        np.searchsorted(_TIER_BOUNDS, score, side="right"), minlength=len(_TIER_ORDER),
+    )
     logger.info(
         "Scored %d accounts -- CRITICAL: %d, HIGH: %d, MEDIUM: %d, LOW: %d",
-        len(df),
-        (df["risk_tier"] == "CRITICAL").sum() if not df.empty else 0,
-        (df["risk_tier"] == "HIGH").sum() if not df.empty else 0,
-        (df["risk_tier"] == "MEDIUM").sum() if not df.empty else 0,
-        (df["risk_tier"] == "LOW").sum() if not df.empty else 0,
+        n_nodes, tier_counts[3], tier_counts[2], tier_counts[1], tier_counts[0],
     )
 
-    return df
+    return ScoreResult(
+        account_id=nodes,
+        risk_score=score,
+        risk_tier=tiers,
+        reasons=reasons_col,
+        reason_codes=codes,
+        pagerank=pr_arr,
+        betweenness=bt_arr,
+        in_degree=np.fromiter(
+            (in_degree.get(v, 0) for v in nodes), dtype=np.int64, count=n_nodes,
+        ),
+        out_degree=np.fromiter(
+            (out_degree.get(v, 0) for v in nodes), dtype=np.int64, count=n_nodes,
+        ),
+        is_payroll=flags["payroll"],
+        is_merchant=flags["merchant"],
+        is_gateway=flags["gateway"],
+    )
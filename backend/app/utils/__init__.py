@@ -4,9 +4,11 @@ utils — Shared Helper Utilities
 Common functions used across the backend.
 
 Modules:
-    helpers — CSV validation, file I/O, constants
+    helpers   — CSV validation, file I/O, constants
+    responses — orjson-backed default JSON response class
 """
 
 from app.utils.helpers import validate_csv, parse_csv, save_upload, UPLOAD_DIR
+from app.utils.responses import ORJSONResponse
 
-__all__ = ["validate_csv", "parse_csv", "save_upload", "UPLOAD_DIR"]
+__all__ = ["validate_csv", "parse_csv", "save_upload", "UPLOAD_DIR", "ORJSONResponse"]
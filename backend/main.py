@@ -8,19 +8,51 @@ Run with:
     uvicorn main:app --reload --port 8000
 """
 
+import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+import orjson
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 
+from app.utils.responses import ORJSONResponse
 from app.routes import upload_router, graph_router, results_router, summary_router
+from app.services import run_detection_pipeline
+
+
+# ---------------------------------------------------------------------------
+# Startup warm-up — run the pipeline once on a 3-node cycle so lazily
+# imported algorithm modules (SciPy for PageRank, Louvain, ...) and any JIT
+# compilation are paid at boot instead of on the first upload.
+# ---------------------------------------------------------------------------
+def _warm_up() -> None:
+    run_detection_pipeline(pd.DataFrame({
+        "transaction_id": ["W1", "W2", "W3"],
+        "sender_id": ["A", "B", "C"],
+        "receiver_id": ["B", "C", "A"],
+        "amount": [5000.0, 5000.0, 5000.0],
+        "timestamp": pd.to_datetime(
+            ["2025-01-01 10:00", "2025-01-01 11:00", "2025-01-01 12:00"]
+        ),
+    }))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _warm_up()
+    yield
+
 
 app = FastAPI(
     title="Money Muling Detection API",
     description="Graph-based fraud detection engine for identifying money mule networks",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # ---------------------------------------------------------------------------
@@ -46,10 +78,14 @@ app.include_router(summary_router, prefix="/api")
 # ---------------------------------------------------------------------------
 # Health check
 # ---------------------------------------------------------------------------
+# Constant payload, serialised once; probes just send the bytes.
+_HEALTH_BODY = orjson.dumps({"status": "ok", "service": "money-muling-detection"})
+
+
 @app.get("/api/health")
 async def health_check():
     """Simple health-check endpoint."""
-    return {"status": "ok", "service": "money-muling-detection"}
+    return Response(_HEALTH_BODY, media_type="application/json")
 
 
 # ---------------------------------------------------------------------------
@@ -57,19 +93,67 @@ async def health_check():
 # ---------------------------------------------------------------------------
 FRONTEND_BUILD = Path(__file__).parent / "static"
 
-if FRONTEND_BUILD.exists():
+# index.html may change on redeploy, so it is revalidated hourly via its
+# ETag; Vite puts a content hash in every assets/ filename, so those never
+# change under the same URL.
+_INDEX_CACHE_CONTROL = "public, max-age=3600"
+_ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles for content-hashed assets: long-lived, immutable caching."""
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = _ASSET_CACHE_CONTROL
+        return response
+
+
+def mount_frontend(app: FastAPI, build_dir: Path) -> None:
+    """Serve a React/Vite build from ``build_dir`` on ``app``.
+
+    Mounts assets/ (Vite) and static/ (legacy CRA), then a catch-all that
+    serves built files by path and index.html for client-side routes. A
+    build without index.html still mounts; the catch-all then 404s.
+    """
     # Serve Vite build assets (assets/) and legacy CRA (static/)
-    assets_dir = FRONTEND_BUILD / "assets"
-    static_dir = FRONTEND_BUILD / "static"
+    assets_dir = build_dir / "assets"
+    static_dir = build_dir / "static"
     if assets_dir.exists():
-        app.mount("/assets", StaticFiles(directory=str(assets_dir)), name="asset-files")
+        app.mount("/assets", ImmutableStaticFiles(directory=str(assets_dir)), name="asset-files")
     if static_dir.exists():
         app.mount("/static", StaticFiles(directory=str(static_dir)), name="static-files")
 
+    # The build is immutable at runtime: index its files once so the
+    # catch-all resolves paths with a set lookup instead of two stat calls.
+    served_files = frozenset(
+        p.relative_to(build_dir).as_posix()
+        for p in build_dir.rglob("*") if p.is_file()
+    )
+    index_html = str(build_dir / "index.html")
+    index_stat = os.stat(index_html) if (build_dir / "index.html").is_file() else None
+    index_headers: dict[str, str] = {}
+    if index_stat is not None:
+        index_headers = {
+            k: v
+            for k, v in FileResponse(index_html, stat_result=index_stat).headers.items()
+            if k in ("etag", "last-modified")
+        }
+        index_headers["cache-control"] = _INDEX_CACHE_CONTROL
+
     @app.get("/{full_path:path}")
-    async def serve_react(full_path: str):
+    async def serve_react(full_path: str, request: Request):
         """Catch-all: serve React/Vite index.html for client-side routing."""
-        file_path = FRONTEND_BUILD / full_path
-        if file_path.exists() and file_path.is_file():
-            return FileResponse(str(file_path))
-        return FileResponse(str(FRONTEND_BUILD / "index.html"))
+        if full_path.startswith("api/"):
+            raise HTTPException(status_code=404, detail="Not Found")
+        if full_path in served_files:
+            return FileResponse(str(build_dir / full_path))
+        if index_stat is None:
+            raise HTTPException(status_code=404, detail="Not Found")
+        if request.headers.get("if-none-match") == index_headers["etag"]:
+            return Response(status_code=304, headers=index_headers)
+        return FileResponse(index_html, stat_result=index_stat, headers=index_headers)
+
+
+if FRONTEND_BUILD.exists():
+    mount_frontend(app, FRONTEND_BUILD)
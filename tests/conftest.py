@@ -1,12 +1,102 @@
-"""Pytest configuration for project-level tests."""
+"""Pytest configuration for project-level tests.
 
-from pathlib import Path
-import sys
+`backend/` is put on the import path by the `pythonpath` setting in
+pyproject.toml, so tests import `app` and `main` directly.
 
+Graph fixtures shared by the feature and scoring suites are built once per
+session and frozen, so a test that tries to mutate one fails instead of
+leaking state into later tests.
+"""
 
-# Ensure `app` package is importable (backend/app)
-PROJECT_ROOT = Path(__file__).resolve().parent.parent
-BACKEND_PATH = PROJECT_ROOT / "backend"
+import gc
+import os
 
-if str(BACKEND_PATH) not in sys.path:
-    sys.path.insert(0, str(BACKEND_PATH))
+# Let nx-cugraph (if installed) register itself before NetworkX is imported.
+os.environ.setdefault("NX_CUGRAPH_AUTOCONFIG", "True")
+
+import networkx as nx  # noqa: E402
+import pytest  # noqa: E402
+
+
+# ── Session setup ─────────────────────────────────────────────────────────
+@pytest.fixture(scope="session", autouse=True)
+def _freeze_import_time_objects():
+    """Move objects created during import and collection out of the
+    tracked GC generations, so collections only scan what tests create.
+
+    The cyclic GC itself stays enabled: reference cycles leaked by app code
+    are collected (and show up) as they would in production.
+    """
+    gc.collect()
+    gc.freeze()
+    yield
+    gc.unfreeze()
+
+
+def pytest_collection_modifyitems(items):
+    """Group unmarked tests by module for ``pytest -n auto --dist=loadgroup``.
+
+    Tests that set ``@pytest.mark.xdist_group`` themselves keep their group.
+    Harmless without pytest-xdist, which is the only reader of the mark.
+    """
+    for item in items:
+        if item.get_closest_marker("xdist_group") is None:
+            item.add_marker(pytest.mark.xdist_group(name=item.module.__name__))
+
+
+# ── Shared graph fixtures ─────────────────────────────────────────────────
+@pytest.fixture(scope="session")
+def empty_graph() -> nx.DiGraph:
+    return nx.freeze(nx.DiGraph())
+
+
+@pytest.fixture(scope="session")
+def simple_graph() -> nx.DiGraph:
+    """A->B->C->A cycle with spur C->D."""
+    G = nx.DiGraph()
+    G.add_edges_from([
+        ("A", "B", {"total_amount": 100, "transaction_count": 1}),
+        ("B", "C", {"total_amount": 200, "transaction_count": 2}),
+        ("C", "A", {"total_amount": 150, "transaction_count": 1}),
+        ("C", "D", {"total_amount": 50, "transaction_count": 1}),
+    ])
+    return nx.freeze(G)
+
+
+@pytest.fixture(scope="session")
+def cycle_graph() -> nx.DiGraph:
+    """A->B->C->A with 5000 on every edge."""
+    G = nx.DiGraph()
+    G.add_edges_from(
+        [("A", "B"), ("B", "C"), ("C", "A")], total_amount=5000, transaction_count=1,
+    )
+    return nx.freeze(G)
+
+
+@pytest.fixture(scope="session")
+def cycle_nodes(cycle_graph) -> tuple[str, ...]:
+    """cycle_graph's nodes, materialised once."""
+    return tuple(cycle_graph)
+
+
+@pytest.fixture(scope="session")
+def fan_in_graph() -> nx.DiGraph:
+    """11 senders into "hub", which forwards to "exit"."""
+    G = nx.DiGraph()
+    G.add_edges_from(
+        [(f"sender_{i}", "hub", {"total_amount": 100, "transaction_count": 1}) for i in range(11)]
+        + [("hub", "exit", {"total_amount": 500, "transaction_count": 1})]
+    )
+    return nx.freeze(G)
+
+
+@pytest.fixture(scope="session")
+def fan_out_graph() -> nx.DiGraph:
+    """"origin" funds "source", which pays out to 11 receivers."""
+    G = nx.DiGraph()
+    G.add_edges_from(
+        [("origin", "source", {"total_amount": 1000, "transaction_count": 1})]
+        + [("source", f"receiver_{i}", {"total_amount": 100, "transaction_count": 1})
+           for i in range(11)]
+    )
+    return nx.freeze(G)
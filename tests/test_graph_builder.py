@@ -1,8 +1,10 @@
 """Tests for transaction graph construction and JSON export."""
 
+import numpy as np
 import pandas as pd
+import pytest
 
-from app.services.graph_builder import build_graph, graph_to_json
+from app.services.graph_builder import build_graph, build_graph_csr, graph_to_csr, graph_to_json
 
 
 def test_build_graph_aggregates_multiple_transactions_between_same_accounts():
@@ -68,6 +70,30 @@ def test_graph_to_json_returns_expected_schema_and_values():
     assert link_ab["total_amount"] == 40.0
 
 
+@pytest.mark.slow
+def test_build_graph_vectorized_scales():
+    """1M transactions over 300 accounts collapse to ~90k aggregated edges."""
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    ids = np.array([f"A{i}" for i in range(300)], dtype=object)
+    df = pd.DataFrame({
+        "sender": ids[rng.integers(0, 300, n)],
+        "receiver": ids[rng.integers(0, 300, n)],
+        "amount": rng.random(n) * 1_000,
+        "timestamp": pd.Timestamp("2026-01-01")
+        + pd.to_timedelta(np.sort(rng.integers(0, 30 * 86_400, n)), unit="s"),
+    })
+
+    graph = build_graph(df)
+
+    expected = df.groupby(["sender", "receiver"])["amount"].agg(["sum", "size"])
+    assert graph.number_of_edges() == len(expected)
+    for (sender, receiver), row in expected.iloc[::997].iterrows():
+        edge = graph[sender][receiver]
+        assert edge["transaction_count"] == row["size"]
+        assert edge["total_amount"] == pytest.approx(row["sum"])
+
+
 def test_build_graph_raises_when_required_columns_missing():
     df = pd.DataFrame(
         [
@@ -81,3 +107,52 @@ def test_build_graph_raises_when_required_columns_missing():
         assert "DataFrame must contain columns" in str(error)
     else:
         raise AssertionError("Expected ValueError for missing required columns")
+
+
+@pytest.mark.parametrize("categorical", [False, True])
+def test_build_graph_csr_matches_build_graph(categorical):
+    df = pd.DataFrame(
+        [
+            {"sender": "A", "receiver": "B", "amount": 100.0, "timestamp": "2026-02-19T10:00:00"},
+            {"sender": "A", "receiver": "B ", "amount": 50.5, "timestamp": "2026-02-19T10:05:00"},
+            {"sender": "B", "receiver": "C", "amount": 20.0, "timestamp": "2026-02-19T10:10:00"},
+            {"sender": "C", "receiver": "A", "amount": 5.0, "timestamp": "2026-02-19T10:15:00"},
+            {"sender": "", "receiver": "A", "amount": 1.0, "timestamp": "2026-02-19T10:20:00"},
+        ]
+    )
+    if categorical:
+        # parse_csv() layout: one dictionary shared by both ID columns
+        id_dtype = pd.CategoricalDtype(["A", "B ", "B", "C", ""])
+        df["sender"] = df["sender"].astype(id_dtype)
+        df["receiver"] = df["receiver"].astype(id_dtype)
+
+    nodes, indptr, indices, total = build_graph_csr(df)
+    expected = graph_to_csr(build_graph(df))
+
+    assert list(nodes) == list(expected[0]) == ["A", "B", "C"]
+    assert indptr.tolist() == expected[1].tolist() == [0, 1, 2, 3]
+    assert indices.tolist() == expected[2].tolist() == [1, 2, 0]
+    assert total.tolist() == expected[3].tolist() == [150.5, 20.0, 5.0]
+
+
+def test_csr_rows_sorted_by_receiver_in_both_builders():
+    # A pays C, D, then B; B and C are numbered before A, so A's adjacency
+    # (insertion order C, D, B) is not already sorted by receiver index
+    df = pd.DataFrame(
+        [
+            {"sender": "B", "receiver": "C", "amount": 1.0, "timestamp": "2026-02-19T10:00:00"},
+            {"sender": "A", "receiver": "C", "amount": 2.0, "timestamp": "2026-02-19T10:01:00"},
+            {"sender": "A", "receiver": "D", "amount": 3.0, "timestamp": "2026-02-19T10:02:00"},
+            {"sender": "A", "receiver": "B", "amount": 4.0, "timestamp": "2026-02-19T10:03:00"},
+        ]
+    )
+    graph = build_graph(df)
+    assert list(graph.succ["A"]) == ["C", "D", "B"]
+
+    nodes, indptr, indices, total = build_graph_csr(df)
+    expected = graph_to_csr(graph)
+
+    assert list(nodes) == list(expected[0]) == ["B", "C", "A", "D"]
+    assert indptr.tolist() == expected[1].tolist() == [0, 1, 1, 4, 4]
+    assert indices.tolist() == expected[2].tolist() == [1, 0, 1, 3]
+    assert total.tolist() == expected[3].tolist() == [1.0, 4.0, 2.0, 3.0]
@@ -0,0 +1,108 @@
+"""Tests for CSV parsing helpers."""
+
+from collections import OrderedDict
+
+import pytest
+
+from app.utils import helpers
+from app.utils.helpers import parse_csv
+
+_HEADER = "transaction_id,sender_id,receiver_id,amount,timestamp\n"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_parse_cache(monkeypatch):
+    """Give each test an empty parse_csv memo."""
+    monkeypatch.setattr(helpers, "_parse_cache", OrderedDict())
+
+
+@pytest.fixture
+def parse_calls(monkeypatch) -> list[str]:
+    """Record every cache miss (real parse) made by parse_csv."""
+    calls: list[str] = []
+    uncached = helpers._parse_csv_uncached
+
+    def _counting(filepath):
+        calls.append(filepath)
+        return uncached(filepath)
+
+    monkeypatch.setattr(helpers, "_parse_csv_uncached", _counting)
+    return calls
+
+
+def _write_csv(path, amount: int = 100) -> str:
+    path.write_text(_HEADER + f"T1,A,B,{amount},2024-01-01 10:00:00\n")
+    return str(path)
+
+
+# ── Parse paths ───────────────────────────────────────────────────────────
+@pytest.fixture(params=["pyarrow", "pandas"])
+def csv_engine(request, monkeypatch):
+    """Run a test through both parse paths (pyarrow, and the pandas fallback)."""
+    if request.param == "pyarrow" and helpers.pacsv is None:
+        pytest.skip("pyarrow not installed")
+    if request.param == "pandas":
+        monkeypatch.setattr(helpers, "pacsv", None)
+    return request.param
+
+
+def test_rows_with_blank_account_ids_are_dropped(tmp_path, csv_engine):
+    path = tmp_path / "txns.csv"
+    path.write_text(
+        _HEADER
+        + "T1,A,B,100,2024-01-01 10:00:00\n"
+        "T2,,B,50,2024-01-01 11:00:00\n"
+        "T3,B,,75,2024-01-01 12:00:00\n"
+        "T4,007,A,25,2024-01-01 13:00:00\n"
+    )
+
+    df = parse_csv(str(path))
+
+    assert df["transaction_id"].tolist() == ["T1", "T4"]
+    assert "" not in df["sender_id"].cat.categories
+    assert set(df["sender_id"].cat.categories) == {"007", "A", "B"}
+
+
+# ── parse_csv memo ────────────────────────────────────────────────────────
+class TestParseCache:
+    def test_identical_content_is_a_hit(self, tmp_path, parse_calls):
+        first = _write_csv(tmp_path / "a.csv")
+        second = _write_csv(tmp_path / "b.csv")  # same bytes, different name
+
+        parse_csv(first)
+        parse_csv(second)
+
+        assert parse_calls == [first]
+
+    def test_changed_content_is_a_miss(self, tmp_path, parse_calls):
+        path = tmp_path / "txns.csv"
+        parse_csv(_write_csv(path, amount=100))
+        parse_csv(_write_csv(path, amount=200))
+
+        assert len(parse_calls) == 2
+
+    def test_least_recently_used_entry_is_evicted(self, tmp_path, parse_calls):
+        paths = [
+            _write_csv(tmp_path / f"t{i}.csv", amount=i)
+            for i in range(helpers._PARSE_CACHE_SIZE + 1)
+        ]
+        for path in paths[:-1]:
+            parse_csv(path)
+        parse_csv(paths[0])  # refresh: paths[1] is now the oldest
+        parse_csv(paths[-1])
+
+        assert len(helpers._parse_cache) == helpers._PARSE_CACHE_SIZE
+        parse_csv(paths[0])
+        parse_csv(paths[1])
+        assert parse_calls == paths + [paths[1]]
+
+    def test_callers_get_an_isolated_copy(self, tmp_path):
+        path = _write_csv(tmp_path / "txns.csv", amount=100)
+
+        df = parse_csv(path)
+        df["amount"] = 0.0
+        df.drop(columns="transaction_id", inplace=True)
+
+        again = parse_csv(path)
+        assert again["amount"].tolist() == [100.0]
+        assert "transaction_id" in again.columns
@@ -0,0 +1,70 @@
+"""Tests for serving the frontend build from main.py."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from main import mount_frontend
+
+
+def _frontend_client(build_dir) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/api/health")
+    async def health():
+        return {"status": "ok"}
+
+    mount_frontend(app, build_dir)
+    return TestClient(app)
+
+
+@pytest.fixture
+def build_dir(tmp_path):
+    """Minimal Vite-style build: index.html, a hashed asset, a root file."""
+    (tmp_path / "index.html").write_text("<!doctype html><div id=root></div>")
+    (tmp_path / "favicon.ico").write_bytes(b"\x00\x00\x01\x00")
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "index-3f2a1c.js").write_text("console.log(1)")
+    return tmp_path
+
+
+class TestServeReact:
+    def test_client_route_gets_index_with_etag(self, build_dir):
+        resp = _frontend_client(build_dir).get("/dashboard/graph")
+        assert resp.status_code == 200
+        assert "id=root" in resp.text
+        assert resp.headers["etag"]
+        assert resp.headers["cache-control"] == "public, max-age=3600"
+
+    def test_matching_if_none_match_is_304(self, build_dir):
+        client = _frontend_client(build_dir)
+        etag = client.get("/").headers["etag"]
+
+        resp = client.get("/dashboard", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.headers["etag"] == etag
+        assert resp.content == b""
+
+    def test_stale_if_none_match_gets_full_index(self, build_dir):
+        resp = _frontend_client(build_dir).get("/", headers={"If-None-Match": '"stale"'})
+        assert resp.status_code == 200
+
+    def test_built_root_file_served_by_path(self, build_dir):
+        resp = _frontend_client(build_dir).get("/favicon.ico")
+        assert resp.status_code == 200
+        assert resp.content == b"\x00\x00\x01\x00"
+
+    def test_unknown_api_path_is_404_not_index(self, build_dir):
+        resp = _frontend_client(build_dir).get("/api/nope")
+        assert resp.status_code == 404
+
+    def test_hashed_assets_are_immutable(self, build_dir):
+        resp = _frontend_client(build_dir).get("/assets/index-3f2a1c.js")
+        assert resp.status_code == 200
+        assert resp.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+    def test_build_without_index_still_serves_api(self, build_dir):
+        (build_dir / "index.html").unlink()
+        client = _frontend_client(build_dir)
+        assert client.get("/api/health").status_code == 200
+        assert client.get("/dashboard").status_code == 404
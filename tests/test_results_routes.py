@@ -0,0 +1,60 @@
+"""
+Tests for the GET /api/results and /api/download endpoints.
+Covers: serialising cached results that hold non-str keys and NumPy values.
+"""
+
+import numpy as np
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+import app.routes.upload_routes as upload_mod
+from main import app
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+# int keys and NumPy values, as pipeline dicts can carry
+_CACHED_RESULT = {
+    "suspicious_accounts": [{"account_id": "A", "suspicion_score": np.float64(91.5)}],
+    "fraud_rings": [],
+    "summary": {"tier_counts": {3: np.int64(1)}},
+}
+_EXPECTED = {
+    "suspicious_accounts": [{"account_id": "A", "suspicion_score": 91.5}],
+    "fraud_rings": [],
+    "summary": {"tier_counts": {"3": 1}},
+}
+
+
+@pytest.fixture
+def cached_result(monkeypatch):
+    monkeypatch.setattr(upload_mod, "latest_result", _CACHED_RESULT)
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+# ---------------------------------------------------------------------------
+# Results and download share one serialisation
+# ---------------------------------------------------------------------------
+# Sets the module-global latest_result, like the upload caching tests
+@pytest.mark.xdist_group(name="caching_serial")
+@pytest.mark.usefixtures("cached_result")
+@pytest.mark.parametrize("path", ["/api/results", "/api/download"])
+def test_serialises_non_str_keys_and_numpy(client, path):
+    resp = client.get(path)
+    assert resp.status_code == 200
+    assert orjson.loads(resp.content) == _EXPECTED
+
+
+@pytest.mark.xdist_group(name="caching_serial")
+@pytest.mark.usefixtures("cached_result")
+def test_download_is_indented_attachment(client):
+    resp = client.get("/api/download")
+    assert resp.headers["content-disposition"] == "attachment; filename=results.json"
+    assert resp.content.startswith(b"{\n  ")
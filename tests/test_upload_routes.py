@@ -4,21 +4,52 @@ Covers: valid upload, invalid extension, empty file, missing columns,
         bad CSV content, and pipeline execution.
 """
 
+import asyncio
 import io
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterator
+
+import httpx
+import orjson
 import pytest
+from fastapi import UploadFile
 from fastapi.testclient import TestClient
 
-from app.routes.upload_routes import latest_result as _  # ensure importable
+import app.routes.upload_routes as upload_mod
+from app.routes.upload_routes import ERR_EMPTY, ERR_NO_ROWS, ERR_NOT_CSV
+from app.utils.helpers import ERR_MISSING_COLUMNS
+from main import app
 
 
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
-@pytest.fixture(scope="module")
+@pytest.fixture(autouse=True)
+def _isolated_upload_dir(tmp_path, monkeypatch):
+    """Save uploads under a per-test directory, not the shared backend/uploads/.
+
+    Keeps parallel (pytest-xdist) workers from truncating each other's file.
+    """
+    monkeypatch.setattr("app.utils.helpers.UPLOAD_DIR", tmp_path)
+
+
+@pytest.fixture(autouse=True)
+def _empty_parse_cache(monkeypatch):
+    """Start each test with an empty parse_csv memo, so no result depends on
+    what an earlier test uploaded."""
+    monkeypatch.setattr("app.utils.helpers._parse_cache", OrderedDict())
+
+
+@pytest.fixture(scope="session")
 def client():
-    """TestClient backed by the real FastAPI app."""
-    from main import app  # noqa: WPS433 — local import for test isolation
-    return TestClient(app)
+    """TestClient backed by the real FastAPI app.
+
+    Entered once per session, so the lifespan warm-up and the client's event
+    loop portal are set up a single time rather than per request.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 VALID_CSV = (
@@ -27,126 +58,203 @@ VALID_CSV = (
     "T2,B,C,200,2024-01-01 11:00:00\n"
     "T3,C,A,150,2024-01-01 12:00:00\n"
 )
+VALID_CSV_BYTES = VALID_CSV.encode("utf-8")
+
+
+def _make_csv(nrows: int) -> bytes:
+    """Valid CSV with ``nrows`` transactions over 100 sender/receiver pairs,
+    appended into one growing buffer (no quadratic string concatenation)."""
+    buf = bytearray(b"transaction_id,sender_id,receiver_id,amount,timestamp\n")
+    for i in range(nrows):
+        buf += f"T{i},A{i % 100},B{i % 100},{100 + i},2024-01-01 10:00:00\n".encode()
+    return bytes(buf)
+
+
+_UPLOAD_CHUNK_BYTES = 1 << 16
+_BOUNDARY = "test-upload-boundary"
+_MULTIPART_HEADERS = {"content-type": f"multipart/form-data; boundary={_BOUNDARY}"}
+
+
+@lru_cache(maxsize=16)
+def _multipart_body(content: bytes, filename: str) -> bytes:
+    """Encoded multipart body for one (content, filename) pair, built once.
+
+    The same few payloads are posted over and over, so the encoding is
+    reused instead of rebuilt by httpx on every request. The cache is
+    bounded so large one-off bodies (the 50k-row case) are evicted rather
+    than held for the whole session.
+    """
+    return b"".join((
+        f"--{_BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: text/csv\r\n\r\n".encode(),
+        content,
+        f"\r\n--{_BOUNDARY}--\r\n".encode(),
+    ))
+
+
+def _chunks(body: bytes) -> Iterator[bytes]:
+    """Yield 64 KiB slices so the body is streamed (chunked), as a browser
+    upload would be, rather than sent as one buffer."""
+    for i in range(0, len(body), _UPLOAD_CHUNK_BYTES):
+        yield body[i:i + _UPLOAD_CHUNK_BYTES]
+
 
+def _as_bytes(content: str | bytes | bytearray) -> bytes:
+    return content.encode() if isinstance(content, str) else bytes(content)
 
-def _upload(client, content: str | bytes, filename: str = "txns.csv"):
+
+def _upload(client, content: str | bytes | bytearray, filename: str = "txns.csv"):
     """Helper to POST a file to /api/upload."""
-    if isinstance(content, str):
-        content = content.encode()
     return client.post(
         "/api/upload",
-        files={"file": (filename, io.BytesIO(content), "text/csv")},
+        content=_chunks(_multipart_body(_as_bytes(content), filename)),
+        headers=_MULTIPART_HEADERS,
     )
 
 
+REQUIRED_SUMMARY_KEYS = frozenset({
+    "total_accounts_analyzed",
+    "suspicious_accounts_flagged",
+    "fraud_rings_detected",
+    "processing_time_seconds",
+})
+
+# Canned pipeline output for tests that only exercise the route
+_STUB_RESULT = {
+    "suspicious_accounts": [],
+    "fraud_rings": [],
+    "summary": {
+        "total_accounts_analyzed": 0,
+        "suspicious_accounts_flagged": 0,
+        "fraud_rings_detected": 0,
+        "processing_time_seconds": 0.0,
+    },
+}
+
+
 # ---------------------------------------------------------------------------
 # Happy path
 # ---------------------------------------------------------------------------
-class TestUploadSuccess:
-    def test_valid_csv_returns_200(self, client):
-        resp = _upload(client, VALID_CSV)
-        assert resp.status_code == 200
-
-    def test_response_has_required_keys(self, client):
-        resp = _upload(client, VALID_CSV)
-        body = resp.json()
-        assert "suspicious_accounts" in body
-        assert "fraud_rings" in body
-        assert "summary" in body
-
-    def test_suspicious_accounts_is_list(self, client):
-        body = _upload(client, VALID_CSV).json()
-        assert isinstance(body["suspicious_accounts"], list)
-
-    def test_fraud_rings_is_list(self, client):
-        body = _upload(client, VALID_CSV).json()
-        assert isinstance(body["fraud_rings"], list)
-
-    def test_summary_is_dict(self, client):
-        body = _upload(client, VALID_CSV).json()
-        assert isinstance(body["summary"], dict)
-
-    def test_summary_contains_expected_fields(self, client):
-        summary = _upload(client, VALID_CSV).json()["summary"]
-        for key in (
-            "total_accounts_analyzed",
-            "suspicious_accounts_flagged",
-            "fraud_rings_detected",
-            "processing_time_seconds",
-        ):
-            assert key in summary, f"Missing summary key: {key}"
+@pytest.mark.integration
+def test_upload_runs_real_pipeline(client):
+    """Response contract of the real detection pipeline, end to end."""
+    resp = _upload(client, VALID_CSV_BYTES)
+    assert resp.status_code == 200
+    body = orjson.loads(resp.content)
+    assert isinstance(body["suspicious_accounts"], list)
+    assert isinstance(body["fraud_rings"], list)
+    assert isinstance(body["summary"], dict)
+    missing = REQUIRED_SUMMARY_KEYS - body["summary"].keys()
+    assert not missing, f"Missing summary keys: {sorted(missing)}"
+    assert body["summary"]["total_accounts_analyzed"] == 3
 
 
-# ---------------------------------------------------------------------------
-# Invalid extension
-# ---------------------------------------------------------------------------
-class TestInvalidExtension:
-    def test_txt_extension_rejected(self, client):
-        resp = _upload(client, VALID_CSV, filename="data.txt")
-        assert resp.status_code == 400
-        assert "csv" in resp.json()["detail"].lower()
+def test_route_returns_pipeline_result_unchanged(client, monkeypatch):
+    result = {
+        "suspicious_accounts": [{"account_id": "A", "suspicion_score": 91.5}],
+        "fraud_rings": [{"ring_id": "RING_001", "member_accounts": ["A", "B"]}],
+        "summary": {"marker": "passed-through"},
+    }
+    monkeypatch.setattr("app.routes.upload_routes.run_detection_pipeline", lambda df: result)
+    resp = _upload(client, VALID_CSV_BYTES)
+    assert resp.status_code == 200
+    assert orjson.loads(resp.content) == result
+
+
+@pytest.mark.parametrize("nrows", [3, 1_000, 50_000])
+def test_upload_passes_every_row_to_pipeline(client, monkeypatch, nrows):
+    row_counts = []
 
-    def test_xlsx_extension_rejected(self, client):
-        resp = _upload(client, VALID_CSV, filename="data.xlsx")
-        assert resp.status_code == 400
+    def _count_rows(df):
+        row_counts.append(len(df))
+        return _STUB_RESULT
 
-    def test_no_extension_rejected(self, client):
-        resp = _upload(client, VALID_CSV, filename="data")
-        assert resp.status_code == 400
+    monkeypatch.setattr("app.routes.upload_routes.run_detection_pipeline", _count_rows)
+    resp = _upload(client, _make_csv(nrows))
+    assert resp.status_code == 200
+    assert row_counts == [nrows]
 
 
 # ---------------------------------------------------------------------------
-# Empty file
+# Rejected uploads: bad extension, empty file, missing columns, bad content
 # ---------------------------------------------------------------------------
-class TestEmptyFile:
-    def test_zero_bytes_rejected(self, client):
-        resp = _upload(client, b"")
-        assert resp.status_code == 400
-        assert "empty" in resp.json()["detail"].lower()
+_HEADER_ONLY_CSV = "transaction_id,sender_id,receiver_id,amount,timestamp\n"
 
-    def test_whitespace_only_rejected(self, client):
-        resp = _upload(client, "   \n  \n  ")
-        assert resp.status_code == 400
 
+# (content, filename, detail prefix or None, whether the upload is saved)
+_REJECTED_CASES = [
+    pytest.param(VALID_CSV_BYTES, "data.txt", ERR_NOT_CSV, False, id="txt_extension"),
+    pytest.param(VALID_CSV_BYTES, "data.xlsx", ERR_NOT_CSV, False, id="xlsx_extension"),
+    pytest.param(VALID_CSV_BYTES, "data", ERR_NOT_CSV, False, id="no_extension"),
+    pytest.param(b"", "txns.csv", ERR_EMPTY, False, id="zero_bytes"),
+    pytest.param("   \n  \n  ", "txns.csv", ERR_EMPTY, False, id="whitespace_only"),
+    pytest.param("sender_id,receiver_id,amount\nA,B,100\n", "txns.csv",
+                 ERR_MISSING_COLUMNS, True, id="missing_required_column"),
+    pytest.param("foo,bar,baz\n1,2,3\n", "txns.csv", ERR_MISSING_COLUMNS, True, id="wrong_headers"),
+    pytest.param(b"\x00\x01\x02\x03\xff\xfe", "txns.csv", None, True, id="non_csv_binary"),
+    # After cleaning, df is empty → 400
+    pytest.param(_HEADER_ONLY_CSV, "txns.csv", ERR_NO_ROWS, True, id="header_only"),
+]
 
-# ---------------------------------------------------------------------------
-# Missing / bad columns
-# ---------------------------------------------------------------------------
-class TestMissingColumns:
-    def test_missing_required_column(self, client):
-        bad_csv = "sender_id,receiver_id,amount\nA,B,100\n"
-        resp = _upload(client, bad_csv)
-        assert resp.status_code == 400
-        assert "column" in resp.json()["detail"].lower()
 
-    def test_completely_wrong_headers(self, client):
-        bad_csv = "foo,bar,baz\n1,2,3\n"
-        resp = _upload(client, bad_csv)
-        assert resp.status_code == 400
+@pytest.mark.parametrize("content, filename, detail_prefix, saved", _REJECTED_CASES)
+def test_rejected_with_400(client, content, filename, detail_prefix, saved,
+                           tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        "app.routes.upload_routes.run_detection_pipeline",
+        lambda df: calls.append(df),
+    )
+    resp = _upload(client, content, filename)
+    assert resp.status_code == 400
+    if detail_prefix:
+        assert orjson.loads(resp.content)["detail"].startswith(detail_prefix)
+    # Always rejected before the pipeline; bad names and blank bodies are
+    # rejected before anything is written to the upload directory
+    assert not calls
+    assert any(tmp_path.iterdir()) is saved
 
 
-# ---------------------------------------------------------------------------
-# Bad CSV content
-# ---------------------------------------------------------------------------
-class TestBadContent:
-    def test_non_csv_binary(self, client):
-        resp = _upload(client, b"\x00\x01\x02\x03\xff\xfe")
-        assert resp.status_code == 400
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
 
-    def test_header_only_no_rows(self, client):
-        header_only = "transaction_id,sender_id,receiver_id,amount,timestamp\n"
-        resp = _upload(client, header_only)
-        # After cleaning, df is empty → 400
-        assert resp.status_code == 400
+@pytest.mark.anyio
+async def test_rejections_served_concurrently():
+    """All rejection cases in flight at once against the ASGI app."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as aclient:
+        responses = await asyncio.gather(*(
+            aclient.post(
+                "/api/upload",
+                content=_multipart_body(_as_bytes(content), filename),
+                headers=_MULTIPART_HEADERS,
+            )
+            for content, filename, *_ in (case.values for case in _REJECTED_CASES)
+        ))
+    assert [resp.status_code for resp in responses] == [400] * len(_REJECTED_CASES)
 
 
 # ---------------------------------------------------------------------------
 # Result caching
 # ---------------------------------------------------------------------------
+@pytest.fixture
+def reset_latest_result():
+    """Clear the route's module-level result cache before and after a test."""
+    upload_mod.latest_result = None
+    yield
+    upload_mod.latest_result = None
+
+
+# Resets the module-global latest_result, so it gets a worker of its own
+@pytest.mark.xdist_group(name="caching_serial")
+@pytest.mark.usefixtures("reset_latest_result")
 class TestResultCaching:
-    def test_latest_result_populated(self, client):
-        import app.routes.upload_routes as mod
-        mod.latest_result = None
-        _upload(client, VALID_CSV)
-        assert mod.latest_result is not None
-        assert "suspicious_accounts" in mod.latest_result
+    def test_latest_result_populated(self):
+        # Calls the handler directly: only the module-level cache is under test
+        upload = UploadFile(io.BytesIO(VALID_CSV_BYTES), filename="txns.csv")
+        asyncio.run(upload_mod.upload_csv(upload))
+        assert upload_mod.latest_result is not None
+        assert "suspicious_accounts" in upload_mod.latest_result